@@ -1,3 +1,7 @@
+import asyncio
+import os
+from typing import List, Tuple
+
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 from app.core.processing import handle_analysis_request, handle_scheduled_analysis
@@ -7,6 +11,9 @@ from app.services.query_parser import parse_user_query, UserQueryParams
 
 router = APIRouter()
 
+# Maximum number of scheduled jobs processed at the same time
+SCHEDULED_JOB_CONCURRENCY = int(os.getenv("SCHEDULED_JOB_CONCURRENCY", "4"))
+
 class AnalysisRequest(BaseModel):
     text: str
     user_id: str
@@ -83,29 +90,41 @@ async def execute_scheduled_jobs(background_tasks: BackgroundTasks):
     try:
         due_jobs = scheduler.get_due_jobs()
         
+        jobs = []
         for job in due_jobs:
             # Update status to running
             scheduler.update_job_status(job.id, "running")
-            
-            # Queue job for processing
-            background_tasks.add_task(
-                process_scheduled_job,
-                scheduler,  # Pass scheduler instance for status updates
-                job.id,
-                job.query_params,
-                job.user_id
-            )
+            jobs.append((job.id, job.query_params, job.user_id))
         
-        return {"status": "processing", "jobs_queued": len(due_jobs)}
+        # Queue all jobs for concurrent processing
+        if jobs:
+            background_tasks.add_task(process_scheduled_jobs, jobs)
+        
+        return {"status": "processing", "jobs_queued": len(jobs)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         scheduler.close()
 
-async def process_scheduled_job(scheduler: SchedulerService, job_id: int, query_params: dict, user_id: str):
-    """Background task handler for scheduled jobs"""
+async def process_scheduled_jobs(jobs: List[Tuple[int, dict, str]]):
+    """Background task handler running due jobs concurrently, at most SCHEDULED_JOB_CONCURRENCY at a time"""
+    semaphore = asyncio.Semaphore(SCHEDULED_JOB_CONCURRENCY)
+    
+    async def run(job_id: int, query_params: dict, user_id: str):
+        async with semaphore:
+            await process_scheduled_job(job_id, query_params, user_id)
+    
+    await asyncio.gather(*(run(*job) for job in jobs), return_exceptions=True)
+
+async def process_scheduled_job(job_id: int, query_params: dict, user_id: str):
+    """Run a scheduled job in a worker thread, keeping its blocking work off the event loop"""
+    await asyncio.to_thread(run_scheduled_job, job_id, query_params, user_id)
+
+def run_scheduled_job(job_id: int, query_params: dict, user_id: str):
+    """Run a scheduled job and record its outcome"""
+    scheduler = SchedulerService()
     try:
-        result = handle_scheduled_analysis(query_params)
+        handle_scheduled_analysis(query_params, user_id, None)
         scheduler.update_job_status(job_id, "completed")
         print(f"Scheduled job {job_id} completed for user {user_id}")
     except Exception as e:
@@ -113,4 +132,3 @@ async def process_scheduled_job(scheduler: SchedulerService, job_id: int, query_
         print(f"Scheduled job {job_id} failed: {str(e)}")
     finally:
         scheduler.close()
-    
@@ -22,7 +22,7 @@ class FilteredComments(BaseModel):
 class VideoAnalysisCrew:
     """Video Analysis Crew for analyzing a YouTube video's content and comments"""
     
-    def __init__(self, video_url: str, analysis_type: str, video_metadata: dict = None):
+    def __init__(self, video_url: str, analysis_type: str, video_metadata: dict = None, llm: Optional[LLM] = None):
         """
         Initialize the crew with all necessary data.
         
@@ -30,10 +30,10 @@ class VideoAnalysisCrew:
             video_url: The URL of the YouTube video
             analysis_type: The type of analysis to perform
             video_metadata: Optional metadata about the video
+            llm: Optional LLM shared across crews; a new one is created if omitted
         """
         # Initialize LLM
-        #self.llm = LLM(model="deepseek/deepseek-chat", api_key=os.getenv("DEEPSEEK_API_KEY"), temperature=1.5)
-        self.llm = LLM(model="gpt-4o-mini")
+        self.llm = llm or self.create_llm()
 
         # Store analysis data
         self.video_url = video_url
@@ -44,6 +44,12 @@ class VideoAnalysisCrew:
         self.report_path: Optional[str] = None
         self.summary_path: Optional[str] = None
 
+    @staticmethod
+    def create_llm() -> LLM:
+        """Create the LLM used by the crew's agents."""
+        #return LLM(model="deepseek/deepseek-chat", api_key=os.getenv("DEEPSEEK_API_KEY"), temperature=1.5)
+        return LLM(model="gpt-4o-mini")
+
     @agent
     def manager(self) -> Agent:
         
@@ -118,6 +124,16 @@ class VideoAnalysisCrew:
             files.append(self.report_path)
         return files
 
+    @property
+    def typed_output_files(self) -> list[tuple[Path, str]]:
+        """Get generated files paired with their Drive folder type: [(path, "summaries"|"reports")]"""
+        files = []
+        if self.summary_path:
+            files.append((Path(self.summary_path), "summaries"))
+        if self.report_path:
+            files.append((Path(self.report_path), "reports"))
+        return files
+
     @task
     def create_summary_task(self) -> Task:
         """Create a focused video summary."""
@@ -1,6 +1,5 @@
 from typing import Optional, Dict, Any, List
 import os
-from googleapiclient.discovery import build
 #from pytubefix import YouTube
 #import whisper
 #import tempfile
@@ -10,8 +9,12 @@ import re
 import json  # Import json for better token debugging
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 from urllib.parse import urlparse, parse_qs
+from functools import lru_cache
 import time
+from app.utils.google_clients import get_youtube_client, YOUTUBE_NUM_RETRIES
 
+# Pure function of the URL, called again for the same URL by search, analysis and comments
+@lru_cache(maxsize=1024)
 def extract_video_id(url: str) -> str:
     parsed_url = urlparse(url)
     if parsed_url.hostname in ['www.youtube.com', 'youtube.com']:
@@ -74,7 +77,7 @@ class YouTubeComments:
             raise ValueError("Invalid YouTube URL provided")
 
         try:
-            youtube = build('youtube', 'v3', developerKey=self.api_key)
+            youtube = get_youtube_client(self.api_key)
             comments = []
             next_page_token = None
             
@@ -90,7 +93,7 @@ class YouTubeComments:
                 if next_page_token:
                     request_params['pageToken'] = next_page_token
                 
-                response = youtube.commentThreads().list(**request_params).execute()
+                response = youtube.commentThreads().list(**request_params).execute(num_retries=YOUTUBE_NUM_RETRIES)
                 
                 for item in response.get('items', []):
                     comment = item['snippet']['topLevelComment']['snippet']
@@ -3,8 +3,10 @@ from dotenv import load_dotenv
 import os
 from app.api.agent_router import router as analysis_router
 from app.api.twilio_router import router as twilio_router
+from app.utils.logging_setup import configure_logging
 # Load environment variables first
 load_dotenv()
+configure_logging()
 
 # Create FastAPI app
 app = FastAPI(
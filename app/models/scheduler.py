@@ -1,5 +1,5 @@
 from datetime import datetime, UTC
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, ForeignKey, Index
 import enum
 from app.models.database import Base
 from sqlalchemy import Enum as SqlEnum  # Import SqlEnum like in messages.py
@@ -37,4 +37,9 @@ class ScheduledJob(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
 
+    __table_args__ = (
+        # Serves the due-jobs range query on next_run
+        Index('ix_scheduled_jobs_next_run_active', 'next_run', 'is_active'),
+    )
+
 
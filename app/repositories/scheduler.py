@@ -1,9 +1,32 @@
 from sqlalchemy.orm import Session
 from app.models.database import SessionLocal
 from app.models.scheduler import ScheduledJob, JobFrequency, JobStatus
+import calendar
 import logging
+import re
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
+
+
+# Valid "H:MM" or "HH:MM" preferred times; the hour is captured
+_TIME_RE = re.compile(r"^([01]?\d|2[0-3]):[0-5]\d$")
+
+
+def _add_month(base_time: datetime) -> datetime:
+    """Move a datetime one month ahead, clamping the day to the length of that month"""
+    # base_time.month is 1-based, so this is the 0-based index of the next month
+    year, month_index = divmod(base_time.year * 12 + base_time.month, 12)
+    month = month_index + 1
+    day = min(base_time.day, calendar.monthrange(year, month)[1])
+    return base_time.replace(year=year, month=month, day=day)
+
+
+# How each frequency moves a run time to its next occurrence
+_FREQUENCY_STEPS: Dict[str, Callable[[datetime], datetime]] = {
+    "daily": lambda base_time: base_time + timedelta(days=1),
+    "weekly": lambda base_time: base_time + timedelta(weeks=1),
+    "monthly": _add_month,
+}
 
 class SchedulerService:
     def __init__(self):
@@ -40,8 +63,10 @@ class SchedulerService:
                             preferred_time: str, **params) -> ScheduledJob:
         """Internal method to create job without database operations"""
         # Adjust time to next hour if not on the hour
-        hour = preferred_time.split(":")[0]
-        preferred_time = f"{hour}:00"
+        match = _TIME_RE.match(preferred_time or "")
+        if not match:
+            raise ValueError(f"Invalid preferred time: {preferred_time!r}")
+        preferred_time = f"{int(match.group(1)):02d}:00"
         
         # Validate frequency using enum
         job_frequency = JobFrequency(frequency)  # Will raise ValueError if invalid
@@ -138,16 +163,9 @@ class SchedulerService:
         )
         
         if base_time <= now:
-            if frequency == "daily":
-                base_time += timedelta(days=1)
-            elif frequency == "weekly":
-                base_time += timedelta(weeks=1)
-            elif frequency == "monthly":
-                # Handle month rollover
-                if base_time.month == 12:
-                    base_time = base_time.replace(year=base_time.year + 1, month=1)
-                else:
-                    base_time = base_time.replace(month=base_time.month + 1)
+            advance = _FREQUENCY_STEPS.get(frequency)
+            if advance is not None:
+                base_time = advance(base_time)
         
         return base_time
 
@@ -1,7 +1,19 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
+import logging
+import os
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+from crewai import LLM
 
 from app.crew.crew import VideoAnalysisCrew
 from app.crew.tools.youtube_tools import YouTubeComments, YouTubeTranscript
@@ -10,6 +22,67 @@ from app.services.google_drive import GoogleDriveManager
 from app.services.report_generator import FinalReportGenerator
 from app.models.database import get_db
 from app.repositories.processed_video import ProcessedVideoRepository
+from app.utils.google_clients import youtube_executor
+
+logger = logging.getLogger(__name__)
+
+# Number of videos whose transcript and comments are fetched concurrently in a batch
+VIDEO_FETCH_CONCURRENCY = int(os.getenv("VIDEO_FETCH_CONCURRENCY", 4))
+
+# Batch IDs are the start time down to the microsecond, so batches started in
+# the same second (e.g. concurrent scheduled jobs) get separate directories.
+# IDs from before microseconds were added are still accepted on reload
+BATCH_ID_FORMAT = '%Y%m%d_%H%M%S_%f'
+_LEGACY_BATCH_ID_FORMAT = '%Y%m%d_%H%M%S'
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for the stdlib json module."""
+    if hasattr(obj, "__dataclass_fields__"):
+        return asdict(obj)
+    return str(obj)
+
+
+def _parse_batch_id(batch_id: str) -> datetime:
+    """Recover the start time encoded in a batch ID."""
+    try:
+        return datetime.strptime(batch_id, BATCH_ID_FORMAT)
+    except ValueError:
+        return datetime.strptime(batch_id, _LEGACY_BATCH_ID_FORMAT)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode an object as compact JSON bytes, preferring orjson."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+@dataclass(slots=True)
+class VideoResult:
+    """Persisted record of a single video analysis in a batch."""
+    video_url: Optional[str] = None
+    video_title: Optional[str] = None
+    status: Optional[str] = None
+    analysis_type: Optional[str] = None
+    file_paths: Optional[List[str]] = None
+    drive_links: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "VideoResult":
+        """Build the record from a result dictionary produced by analyze_video."""
+        video_info = result.get("video_info") or {}
+        return cls(
+            video_url=video_info.get("url") or result.get("video_url"),
+            video_title=video_info.get("title"),
+            status=result.get("status"),
+            analysis_type=result.get("analysis_type"),
+            file_paths=result.get("file_paths"),
+            drive_links=result.get("drive_links"),
+            error=result.get("error")
+        )
+
 
 class BatchResults:
     """
@@ -20,47 +93,128 @@ class BatchResults:
     - Get all successful results
     - Get statistics about the batch
     - Save results to disk
+    
+    Each result is appended to results.jsonl in the batch directory as it is
+    added, so a crashed batch can be recovered with reload_from_disk().
     """
     
-    def __init__(self, query: Optional[str] = None):
+    def __init__(self, query: Optional[str] = None, batch_id: Optional[str] = None):
         """
         Initialize a new batch results container.
         
         Args:
             query: Optional search query that generated this batch
+            batch_id: Optional ID of an existing batch to reopen
         """
         self.results = []
-        self.start_time = datetime.now()
+        self.start_time = _parse_batch_id(batch_id) if batch_id else datetime.now()
         self.end_time = None
         self.query = query
         
+        # Monotonic clock readings used for the batch duration; a reopened batch
+        # is backdated to the wall-clock start encoded in its ID
+        self._t0 = time.monotonic()
+        if batch_id:
+            self._t0 -= (datetime.now() - self.start_time).total_seconds()
+        self._t1 = None
+        
+        # Partition of results by status, computed once when the batch completes
+        self._successful = None
+        self._failed = None
+        
+        # Status counters maintained on insert so statistics are O(1)
+        self._success_count = 0
+        self._failed_count = 0
+        
         # Create batch directory
-        self.batch_id = self.start_time.strftime('%Y%m%d_%H%M%S')
+        self.batch_id = batch_id or self.start_time.strftime(BATCH_ID_FORMAT)
         self.batch_dir = Path("docs") / "batches" / self.batch_id
         self.batch_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Append-only log of results, opened on the first insert
+        self._results_file = None
     
-    def add_result(self, result: Dict[str, Any]):
-        """Add a result to the batch."""
+    @classmethod
+    def reload_from_disk(cls, batch_id: str) -> "BatchResults":
+        """
+        Rebuild a batch from the results it persisted before stopping.
+        
+        Restored results contain the fields of VideoResult.
+        New results added to the returned batch are appended to the same log.
+        
+        Args:
+            batch_id: ID of the batch directory under docs/batches
+            
+        Returns:
+            BatchResults populated with the persisted results
+        """
+        batch = cls(batch_id=batch_id)
+        
+        metadata_file = batch.batch_dir / "metadata.json"
+        if metadata_file.exists():
+            with open(metadata_file, 'rb') as f:
+                batch.query = json.loads(f.read()).get("statistics", {}).get("query")
+        
+        results_file = batch.batch_dir / "results.jsonl"
+        if results_file.exists():
+            with open(results_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        batch._insert(json.loads(line))
+        
+        return batch
+    
+    def _insert(self, result: Dict[str, Any]):
+        """Add a result in memory without persisting it."""
+        status = result.get("status")
+        self._success_count += status == "success"
+        self._failed_count += status == "error"
         self.results.append(result)
+        self._successful = None
+        self._failed = None
+    
+    def add_result(self, result: Dict[str, Any]):
+        """Add a result to the batch and append it to the results log."""
+        self._insert(result)
+        
+        if self._results_file is None:
+            self._results_file = open(self.batch_dir / "results.jsonl", 'ab', buffering=1 << 16)
+        self._results_file.write(_dumps(VideoResult.from_result(result)) + b'\n')
+        self._results_file.flush()
     
     def complete_batch(self):
-        """Mark the batch as complete."""
+        """Mark the batch as complete and partition the results by status."""
         self.end_time = datetime.now()
+        self._t1 = time.monotonic()
+        
+        if self._results_file is not None:
+            self._results_file.flush()
+            os.fsync(self._results_file.fileno())
+            self._results_file.close()
+            self._results_file = None
+        
+        self._successful = [r for r in self.results if r.get("status") == "success"]
+        self._failed = [r for r in self.results if r.get("status") == "error"]
     
     def get_successful_results(self):
         """Get all successful results."""
+        if self._successful is not None:
+            return self._successful
         return [r for r in self.results if r.get("status") == "success"]
     
     def get_failed_results(self):
         """Get all failed results."""
+        if self._failed is not None:
+            return self._failed
         return [r for r in self.results if r.get("status") == "error"]
     
     def get_statistics(self):
         """Get statistics about the batch."""
-        successful = len(self.get_successful_results())
-        failed = len(self.get_failed_results())
+        successful = self._success_count
+        failed = self._failed_count
         total = len(self.results)
-        duration = (self.end_time - self.start_time).total_seconds() if self.end_time else None
+        # Elapsed time so far while the batch is still running
+        duration = (self._t1 if self._t1 is not None else time.monotonic()) - self._t0
         
         return {
             "batch_id": self.batch_id,
@@ -75,25 +229,20 @@ class BatchResults:
         }
     
     def save_metadata(self):
-        """Save batch metadata to a JSON file."""
+        """
+        Save batch statistics to a JSON file.
+        
+        Individual results are already persisted in results.jsonl by
+        add_result, so only the statistics are written here.
+        """
         metadata = {
             "statistics": self.get_statistics(),
-            "results": [
-                {
-                    "video_url": r.get("video_info", {}).get("url") or r.get("video_url"),
-                    "video_title": r.get("video_info", {}).get("title"),
-                    "status": r.get("status"),
-                    "analysis_type": r.get("analysis_type"),
-                    "file_path": r.get("file_path"),
-                    "error": r.get("error")
-                }
-                for r in self.results
-            ]
+            "results_file": "results.jsonl"
         }
         
         metadata_file = self.batch_dir / "metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        with open(metadata_file, 'wb') as f:
+            f.write(_dumps(metadata))
         
         return str(metadata_file)
 
@@ -105,19 +254,23 @@ class BatchResults:
             "final_report": None  # Initialize as None, not an empty list
         }
         
+        summaries = all_links["summaries"]
+        reports = all_links["reports"]
+        final_report = None
+        
         # First, collect links from individual results
         for result in self.get_successful_results():
-            if "drive_links" in result:
-                for link_type in ["summaries", "reports"]:
-                    all_links[link_type].extend(result["drive_links"].get(link_type, []))
-                
-                # If this result has a final_report, use it
-                if "final_report" in result["drive_links"] and result["drive_links"]["final_report"]:
-                    all_links["final_report"] = result["drive_links"]["final_report"]
+            drive_links = result.get("drive_links")
+            if not drive_links:
+                continue
+            summaries.extend(drive_links.get("summaries", ()))
+            reports.extend(drive_links.get("reports", ()))
+            
+            # If this result has a final_report, use it
+            final_report = drive_links.get("final_report") or final_report
         
-        # Check if we have a final_report attribute directly on the batch
-        if hasattr(self, 'final_report_link') and self.final_report_link:
-            all_links["final_report"] = self.final_report_link
+        # A final_report attribute directly on the batch takes precedence
+        all_links["final_report"] = getattr(self, 'final_report_link', None) or final_report
         
         return all_links
 
@@ -136,58 +289,88 @@ def collect_video_data(url: str) -> tuple[str, List[Dict[str, Any]]]:
         RuntimeError: If transcript extraction fails
         ValueError: If the URL is invalid
     """
-    print("\n📥 Collecting video data...")
+    logger.info("📥 Collecting video data for %s", url)
+    
+    def _get_comments():
+        try:
+            comments = YouTubeComments().get_comments(url, max_comments=200)
+            logger.info("Retrieved %d comments", len(comments))
+            return comments
+        except Exception as e:
+            logger.warning("Failed to get comments: %s", e)
+            return []
+    
+    # Transcript and comments are independent network fetches, so run them
+    # together on the shared YouTube workers
+    logger.debug("Getting video transcript and comments...")
+    transcript_future = youtube_executor.submit(YouTubeTranscript().get_transcript, url)
+    comments_future = youtube_executor.submit(_get_comments)
+    transcript_data = transcript_future.result()
+    comments = comments_future.result()
     
-    # Get transcript
-    print("Getting video transcript...")
-    transcript_data = YouTubeTranscript().get_transcript(url)
     if transcript_data["source"] == "error":
-        print(f"Failed to get transcript: {transcript_data['text']}")
+        logger.error("Failed to get transcript: %s", transcript_data['text'])
         return None, None
     transcript = transcript_data["text"]
-    
-    # Get comments
-    print("Getting video comments...")
-    try:
-        comments = YouTubeComments().get_comments(url, max_comments=200)
-        print(f"Retrieved {len(comments)} comments")
-    except Exception as e:
-        print(f"Warning: Failed to get comments: {e}")
-        comments = []
 
     return transcript, comments
 
 
 def cleanup_files(file_paths: List[str]) -> None:
-    """Remove local files after successful upload."""
-    print("\n=== Starting cleanup_files ===")
+    """
+    Remove local files after successful upload.
+    
+    Each file is unlinked directly (a missing file is not an error), and
+    parent directories left empty are removed once per directory at the end.
+    """
+    logger.debug("Starting cleanup_files")
+    parents = set()
     for file_path in file_paths:
-        print(f"\nAttempting to cleanup: {file_path}")
         try:
-            path = Path(file_path)
-            if path.exists():
-                path.unlink()
-                print(f"Successfully deleted file: {file_path}")
-                
-                # Try to remove parent directory if empty
-                parent_dir = path.parent
-                if parent_dir.exists() and not any(parent_dir.iterdir()):
-                    parent_dir.rmdir()
-                    print(f"Removed empty directory: {parent_dir}")
-            else:
-                print(f"File already deleted: {file_path}")
-                
+            os.unlink(file_path)
+            parents.add(os.path.dirname(file_path))
+            logger.debug("Successfully deleted file: %s", file_path)
+        except FileNotFoundError:
+            logger.debug("File already deleted: %s", file_path)
         except Exception as e:
-            print(f"Cleanup error for {file_path}: {e}")
+            logger.error("Cleanup error for %s: %s", file_path, e)
+    
+    # Try to remove parent directories that are now empty
+    for parent_dir in parents:
+        try:
+            with os.scandir(parent_dir or ".") as entries:
+                is_empty = next(entries, None) is None
+            if is_empty and parent_dir:
+                os.rmdir(parent_dir)
+                logger.debug("Removed empty directory: %s", parent_dir)
+        except OSError as e:
+            logger.error("Cleanup error for %s: %s", parent_dir, e)
+
+
+def _get_drive(drive_manager: Optional[GoogleDriveManager] = None, folder_ids: Optional[Dict[str, str]] = None) -> tuple[GoogleDriveManager, Dict[str, str]]:
+    """Return the given Drive manager and folder IDs, creating whichever is missing."""
+    if drive_manager is None:
+        drive_manager = GoogleDriveManager()
+    if folder_ids is None:
+        folder_ids = drive_manager.setup_folder_structure()
+    return drive_manager, folder_ids
 
 
-def upload_analysis_files(video_info: Dict[str, Any], crew_manager: VideoAnalysisCrew, cleanup: bool = True) -> Dict[str, Any]:
-    """Upload analysis files to Drive and return links"""
-    print("\n=== Starting upload_analysis_files ===")
-    print(f"Output files to process: {crew_manager.output_files}")
+def upload_analysis_files(video_info: Dict[str, Any], crew_manager: VideoAnalysisCrew, cleanup: bool = True, drive_manager: Optional[GoogleDriveManager] = None, folder_ids: Optional[Dict[str, str]] = None) -> tuple[Dict[str, Any], List[str]]:
+    """
+    Upload analysis files to Drive and return links.
+    
+    Pass drive_manager and folder_ids to reuse an already authenticated
+    manager and folder structure across the videos of a batch.
+    
+    Returns:
+        Tuple of the drive links and the local file paths that still exist
+        after the upload (files removed by cleanup are excluded)
+    """
+    logger.debug("Starting upload_analysis_files")
+    logger.debug("Output files to process: %s", crew_manager.output_files)
     
-    drive_manager = GoogleDriveManager()
-    folder_ids = drive_manager.setup_folder_structure()
+    drive_manager, folder_ids = _get_drive(drive_manager, folder_ids)
     
     drive_links = {
         "summaries": [],
@@ -195,76 +378,110 @@ def upload_analysis_files(video_info: Dict[str, Any], crew_manager: VideoAnalysi
     }
     
     successful_uploads = []
+    existing_paths = []
+    uploaded = []
+
+    # Upload only existing files concurrently, deferring link sharing to a single batch request
+    futures = []
+    for path, file_type in crew_manager.typed_output_files:
+        file_path = str(path)
+        logger.debug("Processing file: %s", file_path)
 
-    # Upload only existing files
-    for file_path in crew_manager.output_files:
-        print(f"\nProcessing file: {file_path}")
-        path = Path(file_path)
-        
         if not path.exists():
-            print(f"File does not exist: {file_path}")
+            logger.warning("File does not exist: %s", file_path)
             continue
-                
+        existing_paths.append(file_path)
+
+        logger.debug("Detected file type: %s", file_type)
+        future = drive_manager.executor.submit(drive_manager.upload_file, file_path, folder_ids[file_type], share=False)
+        futures.append((file_path, file_type, future))
+
+    for file_path, file_type, future in futures:
         try:
-            file_type = "summaries" if "/summary/" in file_path else "reports"
-            print(f"Detected file type: {file_type}")
-            
-            upload_result = drive_manager.upload_file(file_path, folder_ids[file_type])
-            print(f"Upload result: {upload_result}")
-            
+            upload_result = future.result()
+            logger.debug("Upload result: %s", upload_result)
+
             if upload_result and 'id' in upload_result:
-                drive_links[file_type].append({
-                    "title": video_info.get("title", "Analysis"),
-                    "link": f"https://drive.google.com/file/d/{upload_result['id']}/view",
-                    "is_gdoc": upload_result.get('is_gdoc', False)
-                })
-                successful_uploads.append(file_path)
-                print(f"Added to successful uploads: {file_path}")
+                uploaded.append((file_path, file_type, upload_result))
         except Exception as e:
-            print(f"Upload error for {file_path}: {e}")
+            logger.error("Upload error for %s: %s", file_path, e)
             continue
-    
-    print(f"\nSuccessful uploads: {successful_uploads}")
-    print(f"Final drive_links: {drive_links}")
+
+    # Share all uploaded files in one batched round trip, skipping files that
+    # inherit link access from their folder
+    if uploaded:
+        shared = {}
+        to_share = []
+        for _, file_type, result in uploaded:
+            if drive_manager.needs_sharing(folder_ids[file_type]):
+                to_share.append(result['id'])
+            else:
+                shared[result['id']] = True
+        if to_share:
+            try:
+                shared.update(drive_manager.share_files(to_share))
+            except Exception as e:
+                logger.error("Batch sharing error: %s", e)
+
+        for file_path, file_type, upload_result in uploaded:
+            if not shared.get(upload_result['id']):
+                continue
+            drive_links[file_type].append({
+                "title": video_info.get("title", "Analysis"),
+                "link": f"https://drive.google.com/file/d/{upload_result['id']}/view",
+                "is_gdoc": upload_result.get('is_gdoc', False)
+            })
+            successful_uploads.append(file_path)
+            logger.debug("Added to successful uploads: %s", file_path)
+
+    logger.info("Successful uploads: %s", successful_uploads)
+    logger.debug("Final drive_links: %s", drive_links)
     
     # Clean up files only after all uploads are complete and if cleanup is requested
     if successful_uploads and cleanup:
-        print("\nStarting cleanup...")
+        logger.debug("Starting cleanup...")
         cleanup_files(successful_uploads)
-        print("Cleanup complete")
+        logger.debug("Cleanup complete")
+        cleaned = set(successful_uploads)
+        existing_paths = [p for p in existing_paths if p not in cleaned]
     
-    return drive_links
+    return drive_links, existing_paths
 
 
-def upload_final_report(final_report: Dict[str, Any]) -> Dict[str, Any]:
-    """Upload final report to Drive and return link"""
-    print("\n=== Starting upload_final_report ===")
+def upload_final_report(final_report: Dict[str, Any], drive_manager: Optional[GoogleDriveManager] = None, folder_ids: Optional[Dict[str, str]] = None, cleanup: bool = True) -> Dict[str, Any]:
+    """
+    Upload final report to Drive and return link.
+    
+    Pass cleanup=False to keep the local file, e.g. when the caller removes
+    it together with other files.
+    """
+    logger.debug("Starting upload_final_report")
     
     if final_report.get("status") != "success" or not final_report.get("file_path"):
-        print(f"No valid final report to upload: {final_report.get('status')}")
+        logger.warning("No valid final report to upload: %s", final_report.get('status'))
         return None
     
     file_path = final_report.get("file_path")
     path = Path(file_path)
     
     if not path.exists():
-        print(f"Final report file does not exist: {file_path}")
+        logger.warning("Final report file does not exist: %s", file_path)
         return None
     
     try:
-        drive_manager = GoogleDriveManager()
-        folder_ids = drive_manager.setup_folder_structure()
+        drive_manager, folder_ids = _get_drive(drive_manager, folder_ids)
         
         # Create a custom name for the final report
         custom_name = f"{datetime.now().strftime('%Y%m%d')}_{final_report.get('query', 'Analysis')}_final.md"
         
         # Upload the file
         upload_result = drive_manager.upload_file(file_path, folder_ids["final"], custom_name)
-        print(f"Final report upload result: {upload_result}")
+        logger.debug("Final report upload result: %s", upload_result)
         
         if upload_result and 'id' in upload_result:
             # Clean up the file after successful upload
-            cleanup_files([file_path])
+            if cleanup:
+                cleanup_files([file_path])
             
             return {
                 "title": final_report.get("query", "Final Analysis"),
@@ -273,23 +490,30 @@ def upload_final_report(final_report: Dict[str, Any]) -> Dict[str, Any]:
             }
         
     except Exception as e:
-        print(f"Final report upload error: {e}")
+        logger.error("Final report upload error: %s", e)
     
     return None
 
 
-def analyze_video(video_url: str, video_info: Dict[str, Any], analysis_type: str = "report", cleanup: bool = True, user_id: str = None, message_id: str = None) -> Dict[str, Any]:
-    """Analyze a single video and generate report/summary"""
+def analyze_video(video_url: str, video_info: Dict[str, Any], analysis_type: str = "report", cleanup: bool = True, user_id: str = None, message_id: str = None, drive_manager: Optional[GoogleDriveManager] = None, folder_ids: Optional[Dict[str, str]] = None, video_data: Optional[tuple] = None, llm: Optional[LLM] = None) -> Dict[str, Any]:
+    """
+    Analyze a single video and generate report/summary.
+    
+    video_data may carry an already collected (transcript, comments) tuple,
+    in which case the video is not fetched again. llm may carry a client
+    shared across the videos of a batch.
+    """
     # try:
-    transcript, comments = collect_video_data(video_url)
+    transcript, comments = video_data if video_data is not None else collect_video_data(video_url)
     if not transcript:
-        print(f"No transcript found for video: {video_url}")
+        logger.warning("No transcript found for video: %s", video_url)
         return None
     
     crew_manager = VideoAnalysisCrew(
         video_url=video_url,
         analysis_type=analysis_type,
-        video_metadata=video_info
+        video_metadata=video_info,
+        llm=llm
     )
     
     # Run analysis
@@ -303,10 +527,8 @@ def analyze_video(video_url: str, video_info: Dict[str, Any], analysis_type: str
     )
 
     # Upload files and get links, but don't clean up yet if cleanup=False
-    drive_links = upload_analysis_files(video_info, crew_manager, cleanup=cleanup)
-    
-    # Store file paths for later cleanup if needed
-    file_paths = [path for path in crew_manager.output_files if Path(path).exists()]
+    # The returned paths are the files still on disk, kept for later cleanup if needed
+    drive_links, file_paths = upload_analysis_files(video_info, crew_manager, cleanup=cleanup, drive_manager=drive_manager, folder_ids=folder_ids)
     
     # After successful analysis and before returning the result
     if user_id and video_info.get('id'):
@@ -325,11 +547,12 @@ def analyze_video(video_url: str, video_info: Dict[str, Any], analysis_type: str
             )
         except Exception as e:
             # Log the error but don't fail the processing
-            print(f"Error saving processed video: {str(e)}")
+            logger.error("Error saving processed video: %s", e)
     
     return {
         "status": "success",
         "type": "single",
+        "analysis_type": analysis_type,
         "drive_links": drive_links,
         "file_paths": file_paths,  # Store for later cleanup
         "video_info": {  # Add this to match what FinalReportGenerator expects
@@ -353,51 +576,75 @@ def analyze_video(video_url: str, video_info: Dict[str, Any], analysis_type: str
     #         "status": "error"
     #     }
 
-def process_video_batch(videos: List[Dict[str, Any]], analysis_type: str = "summary", query: Optional[str] = None, user_id: str = None, message_id: str = None) -> BatchResults:
+def process_video_batch(videos: List[Dict[str, Any]], analysis_type: str = "summary", query: Optional[str] = None, user_id: str = None, message_id: str = None, drive_manager: Optional[GoogleDriveManager] = None, folder_ids: Optional[Dict[str, str]] = None) -> BatchResults:
     """Synchronous batch processing with final report generation"""
     batch = BatchResults(query=query)
     
-    for video in videos:
-        # Pass cleanup=False to prevent immediate file deletion
-        result = analyze_video(video['url'], video, analysis_type, cleanup=False, user_id=user_id, message_id=message_id)
-        if not result:
-            print(f"Skipping video: {video['url']} because of error")
-            continue
-        batch.add_result(result)
+    # Authenticate and resolve the folder structure once for the whole batch
+    drive_manager, folder_ids = _get_drive(drive_manager, folder_ids)
+    
+    # Share one LLM client across every video's crew; agents and tasks still
+    # bind per-video metadata and output files, so the crews are built per video
+    llm = VideoAnalysisCrew.create_llm()
+    
+    # Fetch every video's transcript and comments up front so network I/O for
+    # later videos overlaps with the analysis of earlier ones
+    with ThreadPoolExecutor(max_workers=VIDEO_FETCH_CONCURRENCY) as executor:
+        data_futures = [executor.submit(collect_video_data, video['url']) for video in videos]
+        
+        for video, data_future in zip(videos, data_futures):
+            # A failed fetch is recorded as a failed result of its video
+            try:
+                video_data = data_future.result()
+            except Exception as e:
+                logger.error("Failed to collect data for %s: %s", video['url'], e)
+                batch.add_result({"video_url": video['url'], "error": str(e), "status": "error"})
+                continue
+            
+            # Pass cleanup=False to prevent immediate file deletion
+            result = analyze_video(video['url'], video, analysis_type, cleanup=False, user_id=user_id, message_id=message_id, drive_manager=drive_manager, folder_ids=folder_ids, video_data=video_data, llm=llm)
+            if not result:
+                logger.warning("Skipping video: %s because of error", video['url'])
+                continue
+            batch.add_result(result)
 
     batch.complete_batch()
     batch.save_metadata()
     
     # Generate final report
-    final_report_link = None
+    final_report = None
     if len(batch.get_successful_results()) > 0:
-        print("\n📊 Generating final report...")
+        logger.info("📊 Generating final report...")
         report_generator = FinalReportGenerator()
         
         # Just pass the batch object - the FinalReportGenerator will extract file paths
         final_report = report_generator.generate_final_report(
             batch_results=batch,
             query=query, 
-            analysis_type=analysis_type
+            analysis_type=analysis_type,
+            user_id=user_id
         )
-        
-        # Upload final report
-        if final_report.get("status") == "success":
-            final_report_link = upload_final_report(final_report)
-            if final_report_link:
-                # Add final report link to batch results
-                drive_links = batch.get_drive_links()
-                drive_links["final_report"] = final_report_link
-                # Store the final report link directly on the batch object
-                batch.final_report_link = final_report_link
-                print(f"\n✅ Added final report link to batch results: {final_report_link}")
-                print(f"Updated drive_links: {drive_links}")
-    
-    # Now that the final report is generated, clean up the individual analysis files
-    print("\n🧹 Cleaning up individual analysis files...")
-    for result in batch.get_successful_results():
-        if "file_paths" in result:
-            cleanup_files(result["file_paths"])
+    
+    file_paths = [fp for result in batch.get_successful_results() for fp in result.get("file_paths", [])]
+    
+    # Upload final report
+    if final_report and final_report.get("status") == "success":
+        final_report_link = upload_final_report(final_report, drive_manager=drive_manager, folder_ids=folder_ids, cleanup=False)
+        if final_report_link:
+            # Add final report link to batch results
+            drive_links = batch.get_drive_links()
+            drive_links["final_report"] = final_report_link
+            # Store the final report link directly on the batch object
+            batch.final_report_link = final_report_link
+            logger.info("✅ Added final report link to batch results: %s", final_report_link)
+            logger.debug("Updated drive_links: %s", drive_links)
+            file_paths.append(final_report["file_path"])
+    
+    # Remove the individual analysis files and the uploaded final report in a
+    # single pass once both are done with, so no two cleanups race on the
+    # same directories
+    logger.info("🧹 Cleaning up individual analysis files...")
+    cleanup_files(file_paths)
     
     return batch
 
@@ -473,6 +720,6 @@ if __name__ == "__main__":
         for i, result in enumerate(successful_results, 1):
             video_info = result["video_info"]
             print(f"\n{i}. {video_info['title']}")
-            print(f"   File: {result['file_path']}")
+            print(f"   Files: {', '.join(result['file_paths'])}")
     
     print("\n✅ Batch processing test complete!")
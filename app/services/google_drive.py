@@ -1,14 +1,182 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional
+import hashlib
+import logging
 import os
+import random
+import threading
+import time
 from datetime import datetime
 import re
-from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import mmap
+from contextlib import contextmanager
 
+import httplib2
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp, Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaInMemoryUpload, MediaIoBaseUpload, BatchHttpRequest
 from googleapiclient.errors import HttpError
 
+from app.utils.json_cache import JsonFileCache
+
+logger = logging.getLogger(__name__)
+
+# Number of uploads run concurrently by a manager's executor
+DRIVE_UPLOAD_CONCURRENCY = int(os.getenv("DRIVE_UPLOAD_CONCURRENCY", 4))
+
+# Retries for rate-limited or transiently failing Drive requests
+DRIVE_MAX_RETRIES = 5
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+_RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+# Drive allows about 10 write requests per second per user; stay just below it
+DRIVE_WRITES_PER_SECOND = 9.0
+DRIVE_WRITE_BURST = 10
+MAX_RETRY_DELAY = 32
+
+# Socket timeout in seconds for Drive connections, so a stalled connection
+# fails and is retried instead of blocking an upload worker forever
+DRIVE_HTTP_TIMEOUT = 60
+
+# Files below this size are sent with a single multipart request instead of
+# opening a resumable upload session first
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Characters that are not allowed in Drive file names
+_INVALID_FILENAME_CHARS = re.compile(r'[\\/*?:"<>|]')
+
+# Longest custom file name created for uploads
+MAX_FILENAME_LENGTH = 200
+
+# Upload MIME type by file extension
+_MIME_TYPES = {
+    '.md': 'text/markdown',
+    '.txt': 'text/plain',
+    '.html': 'text/html',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.doc': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+# Folder IDs by account, parent and name, shared by every manager and kept across runs
+_folder_cache = JsonFileCache("drive_folders")
+
+# Complete folder structures by account and base folder, with whether the base
+# folder is shared by link. Entries expire so that sharing changes are picked up
+DRIVE_STRUCTURE_CACHE_TTL = int(os.getenv("DRIVE_STRUCTURE_CACHE_TTL", 24 * 3600))
+_structure_cache = JsonFileCache("drive_folder_structures", ttl=DRIVE_STRUCTURE_CACHE_TTL)
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket for client-side rate limiting.
+    
+    Callers may take more tokens than are available; they then wait until the
+    bucket has refilled enough to cover the debt, so later callers queue
+    behind them and the long-run rate never exceeds the limit.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 1) -> None:
+        """Take tokens from the bucket, sleeping until they are available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# Shared by every manager because the Drive write quota is per user
+_write_limiter = _TokenBucket(DRIVE_WRITES_PER_SECOND, DRIVE_WRITE_BURST)
+
+
+class UploadTask(NamedTuple):
+    """A file queued for upload, with its destination resolved up front."""
+    file_path: str
+    folder_id: str
+    custom_name: str
+    analysis_type: str
+    mime_type: str
+
+
+def _file_size(task: UploadTask) -> int:
+    """Size of a task's file in bytes, or 0 if it can't be read."""
+    try:
+        return os.stat(task.file_path).st_size
+    except OSError:
+        return 0
+
+
+@lru_cache(maxsize=None)
+def _load_credentials(credentials_file: str, scopes: tuple):
+    """Load service account credentials once per key file and scopes."""
+    return service_account.Credentials.from_service_account_file(credentials_file, scopes=list(scopes))
+
+
+_refresh_lock = threading.Lock()
+
+# Drive services of the current thread by credentials file and scopes
+_thread_services = threading.local()
+
+
+def _ensure_token(credentials) -> None:
+    """
+    Refresh the access token ahead of a request if it is missing or about to expire.
+    
+    Without this, every worker thread that notices an expiring token refreshes
+    it on its own. Here one thread refreshes while the others wait and then
+    reuse the new token.
+    """
+    if credentials.valid:
+        return
+    with _refresh_lock:
+        if not credentials.valid:
+            credentials.refresh(Request(httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT)))
+
+
+@contextmanager
+def _open_media(file_path: str, mime_type: str):
+    """
+    Open a local file as an upload body.
+    
+    Small files are read into memory up front, so no disk I/O happens while
+    the request is being sent. Large files are memory-mapped with sequential
+    read-ahead, so the kernel pages in the next chunk while the current one
+    is on the wire.
+    
+    Args:
+        file_path: Path to the file to upload
+        mime_type: MIME type of the file content
+        
+    Yields:
+        A googleapiclient media upload object
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    with open(file_path, 'rb') as f:
+        # Small files skip the extra round trip that opens a resumable session
+        if os.fstat(f.fileno()).st_size < RESUMABLE_THRESHOLD:
+            yield MediaInMemoryUpload(f.read(), mimetype=mime_type, resumable=False)
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield MediaIoBaseUpload(mapped, mimetype=mime_type, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+
+
 class GoogleDriveManager:
     """
     Class for managing Google Drive operations using a Service Account.
@@ -46,11 +214,50 @@ class GoogleDriveManager:
                 "Please download it from the Google Cloud Console."
             )
         
-        print(f"Using service account credentials file: {self.credentials_file}")
+        logger.info("Using service account credentials file: %s", self.credentials_file)
         
-        self.service = self._authenticate()
         self.root_folder_id = None
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        
+        # Folders created by this manager, which are known to be empty
+        self._created_folder_ids = set()
+        
+        # Folders whose files inherit "anyone with the link" access
+        self._public_folder_ids = set()
+        
+        # Files uploaded by this manager by folder, name, conversion and content
+        # hash, so an identical upload retried within a run reuses the first one
+        self._uploaded_files: Dict[tuple, Dict[str, Any]] = {}
+        self.upload_google_docs = os.getenv("UPLOAD_GOOGLE_DOCS", "false").lower() == "true"
+        self.executor = ThreadPoolExecutor(max_workers=DRIVE_UPLOAD_CONCURRENCY)
+    
+    @property
+    def service(self):
+        """
+        Google Drive API service for the current thread.
+        
+        The service wraps an httplib2 connection that is not thread-safe, so
+        each thread gets its own service (and keep-alive connection). It is
+        built on first use and shared by every manager using the same
+        credentials file in that thread.
+        """
+        services = getattr(_thread_services, 'services', None)
+        if services is None:
+            services = _thread_services.services = {}
+        
+        key = (self.credentials_file, tuple(self.SCOPES))
+        service = services.get(key)
+        if service is None:
+            service = services[key] = self._authenticate()
+        return service
+    
+    @property
+    def credentials(self):
+        """Service account credentials, loaded once and shared by every manager using the same file."""
+        try:
+            return _load_credentials(self.credentials_file, tuple(self.SCOPES))
+        except Exception as e:
+            logger.error("Authentication error: %s", e)
+            raise
         
     def _authenticate(self):
         """
@@ -63,17 +270,80 @@ class GoogleDriveManager:
             Exception: If authentication fails
         """
         try:
-            credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_file, scopes=self.SCOPES
-            )
+            # A dedicated httplib2.Http keeps its TLS connection to googleapis.com
+            # open, so every request made by this thread reuses it
+            http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=DRIVE_HTTP_TIMEOUT))
             
-            # Build and return the Drive service
-            return build('drive', 'v3', credentials=credentials)
+            # Build and return the Drive service from the discovery document
+            # bundled with the client library, without fetching or caching it
+            return build('drive', 'v3', http=http, static_discovery=True, cache_discovery=False)
             
         except Exception as e:
-            print(f"Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
             raise
     
+    @staticmethod
+    def _retry_delay(error: HttpError, attempt: int) -> Optional[float]:
+        """
+        Get how long to wait before retrying a failed request.
+        
+        Args:
+            error: Error raised by the request
+            attempt: Zero-based number of the failed attempt
+            
+        Returns:
+            Delay in seconds, or None if the error is not retryable
+        """
+        status = error.resp.status
+        if status == 403:
+            reasons = {detail.get('reason') for detail in (error.error_details or []) if isinstance(detail, dict)}
+            if not reasons & _RATE_LIMIT_REASONS:
+                return None
+        elif status not in _RETRYABLE_STATUSES:
+            return None
+        
+        # Prefer the delay requested by the server, else back off exponentially
+        retry_after = error.resp.get('retry-after')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+    
+    def _execute(self, request, writes: int = 0):
+        """
+        Execute a Drive request, retrying rate-limited and transient failures.
+        
+        Connection errors are only retried for read-only requests: a write may
+        have been applied before the connection dropped, and repeating it would
+        create a duplicate file or folder.
+        
+        Args:
+            request: googleapiclient HttpRequest or BatchHttpRequest to execute
+            writes: Number of write calls in the request, counted against the
+                    client-side write rate limit on every attempt
+            
+        Returns:
+            The response of the request
+        """
+        for attempt in range(DRIVE_MAX_RETRIES + 1):
+            if writes:
+                _write_limiter.acquire(writes)
+            _ensure_token(self.credentials)
+            try:
+                return request.execute()
+            except HttpError as error:
+                delay = self._retry_delay(error, attempt)
+                if delay is None or attempt == DRIVE_MAX_RETRIES:
+                    raise
+                logger.warning("Drive request failed with status %s, retrying in %.1fs", error.resp.status, delay)
+                time.sleep(delay)
+            except (TimeoutError, ConnectionError) as error:
+                # Stalled or dropped connections are reopened on the next attempt
+                if writes or attempt == DRIVE_MAX_RETRIES:
+                    raise
+                delay = min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+                logger.warning("Drive connection error: %s, retrying in %.1fs", error, delay)
+                time.sleep(delay)
+    
     def _create_folder(self, folder_name: str, parent_id: Optional[str] = None) -> str:
         """
         Create a folder in Google Drive.
@@ -97,21 +367,29 @@ class GoogleDriveManager:
             folder_metadata['parents'] = [parent_id]
             
         try:
-            folder = self.service.files().create(
+            folder = self._execute(self.service.files().create(
                 body=folder_metadata,
                 fields='id'
-            ).execute()
+            ), writes=1)
             
+            self._created_folder_ids.add(folder.get('id'))
             return folder.get('id')
             
         except HttpError as error:
-            print(f"Error creating folder: {error}")
+            logger.error("Error creating folder: %s", error)
             raise
     
+    def _folder_cache_key(self, folder_name: str, parent_id: Optional[str] = None) -> str:
+        """Build the folder cache key, scoped to the service account."""
+        account = getattr(self.credentials, 'service_account_email', '')
+        return f"{account}:{parent_id or 'root'}/{folder_name}"
+    
     def _find_or_create_folder(self, folder_name: str, parent_id: Optional[str] = None) -> str:
         """
         Find a folder by name or create it if it doesn't exist.
         
+        Folder IDs are cached on disk, so known folders cost no API call.
+        
         Args:
             folder_name: Name of the folder to find/create
             parent_id: ID of the parent folder (None for root)
@@ -119,30 +397,157 @@ class GoogleDriveManager:
         Returns:
             ID of the found or created folder
         """
-        query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder'"
+        cache_key = self._folder_cache_key(folder_name, parent_id)
+        folder_id = _folder_cache.get(cache_key)
+        if folder_id:
+            return folder_id
         
-        if parent_id:
-            query += f" and '{parent_id}' in parents"
-            
         try:
-            response = self.service.files().list(
-                q=query,
+            # Only the first match is used, so ask for one ID and nothing else
+            response = self._execute(self.service.files().list(
+                q=self._folder_query(folder_name, parent_id),
                 spaces='drive',
-                fields='files(id, name)'
-            ).execute()
+                pageSize=1,
+                fields='files(id)'
+            ))
             
             files = response.get('files', [])
             
             if files:
                 # Folder exists, return its ID
-                return files[0].get('id')
+                folder_id = files[0].get('id')
             else:
                 # Folder doesn't exist, create it
-                return self._create_folder(folder_name, parent_id)
+                folder_id = self._create_folder(folder_name, parent_id)
                 
         except HttpError as error:
-            print(f"Error finding folder: {error}")
-            return self._create_folder(folder_name, parent_id)
+            logger.error("Error finding folder: %s", error)
+            folder_id = self._create_folder(folder_name, parent_id)
+        
+        _folder_cache.set(cache_key, folder_id)
+        return folder_id
+    
+    @staticmethod
+    def _folder_query(folder_name: str, parent_id: Optional[str] = None) -> str:
+        """Build the files.list query matching a folder by name and parent."""
+        query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
+        
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        
+        return query
+    
+    def _find_or_create_folders(self, folder_names: List[str], parent_id: Optional[str] = None, lookup: bool = True) -> Dict[str, str]:
+        """
+        Find several folders by name or create the missing ones.
+        
+        Cached folders cost no API call. The remaining folders are looked up
+        with a single files.list query and all creations are sent in one batch
+        request, so this costs at most two round trips regardless of the
+        number of folders.
+        
+        Args:
+            folder_names: Names of the folders to find/create
+            parent_id: ID of the parent folder (None for root)
+            lookup: Whether to look for existing folders. Pass False when the
+                    parent was just created, so all folders are created directly
+            
+        Returns:
+            Dictionary mapping each folder name to its ID
+        """
+        folder_ids = {}
+        for folder_name in folder_names:
+            folder_id = _folder_cache.get(self._folder_cache_key(folder_name, parent_id))
+            if folder_id:
+                folder_ids[folder_name] = folder_id
+        
+        to_find = [name for name in folder_names if name not in folder_ids]
+        if not to_find:
+            return folder_ids
+        
+        if lookup:
+            self._find_folders(to_find, parent_id, folder_ids)
+        
+        missing = [name for name in folder_names if name not in folder_ids]
+        if missing:
+            folder_ids.update(self._create_folders(missing, parent_id))
+        
+        for folder_name in to_find:
+            _folder_cache.set(self._folder_cache_key(folder_name, parent_id), folder_ids[folder_name])
+        
+        return folder_ids
+    
+    def _find_folders(self, folder_names: List[str], parent_id: Optional[str], folder_ids: Dict[str, str]) -> None:
+        """
+        Look up several folders by name with a single files.list query.
+        
+        Args:
+            folder_names: Names of the folders to find
+            parent_id: ID of the parent folder (None for root)
+            folder_ids: Dictionary updated with the ID of each folder found
+        """
+        names = " or ".join(f"name='{folder_name}'" for folder_name in folder_names)
+        query = f"({names}) and mimeType='application/vnd.google-apps.folder' and trashed=false"
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        
+        try:
+            response = self._execute(self.service.files().list(
+                q=query,
+                spaces='drive',
+                fields='files(id, name)'
+            ))
+            
+            # Keep the first match per name, as _find_or_create_folder does
+            for file in response.get('files', []):
+                folder_ids.setdefault(file.get('name'), file.get('id'))
+                
+        except HttpError as error:
+            logger.error("Error finding folders: %s", error)
+    
+    def _create_folders(self, folder_names: List[str], parent_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        Create several folders with a single batch request.
+        
+        Args:
+            folder_names: Names of the folders to create
+            parent_id: ID of the parent folder (None for root)
+            
+        Returns:
+            Dictionary mapping each folder name to its new ID
+            
+        Raises:
+            HttpError: If any folder creation fails
+        """
+        folder_ids = {}
+        errors = {}
+        
+        def _on_created(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = exception
+                return
+            folder_ids[request_id] = response.get('id')
+        
+        batch = self.new_batch(callback=_on_created)
+        for folder_name in folder_names:
+            folder_metadata = {
+                'name': folder_name,
+                'mimeType': 'application/vnd.google-apps.folder'
+            }
+            if parent_id:
+                folder_metadata['parents'] = [parent_id]
+            batch.add(
+                self.service.files().create(body=folder_metadata, fields='id'),
+                request_id=folder_name
+            )
+        self._execute(batch, writes=len(folder_names))
+        
+        if errors:
+            logger.error("Error creating folders: %s", errors)
+            raise next(iter(errors.values()))
+        
+        self._created_folder_ids.update(folder_ids.values())
+        return folder_ids
     
     def setup_folder_structure(self, base_folder_name: str = "YouTube Analysis") -> Dict[str, str]:
         """
@@ -157,6 +562,9 @@ class GoogleDriveManager:
         - Reports subfolder
         - Final Reports subfolder
         
+        A previously resolved structure, and whether its base folder is shared
+        by link, is reused after a single batched check that its folders still exist.
+        
         Args:
             base_folder_name: Name of the base folder (used only if FOLDER_ID is not set)
             
@@ -166,29 +574,167 @@ class GoogleDriveManager:
         # Check if we have a folder ID in environment variables
         env_folder_id = os.getenv("FOLDER_ID")
         
+        structure_key = self._folder_cache_key(env_folder_id or base_folder_name, "structure")
+        cached = _structure_cache.get(structure_key)
+        cached_ids = cached.get("folder_ids") if cached else None
+        if cached_ids:
+            if self._folders_exist(list(cached_ids.values())):
+                self.root_folder_id = cached_ids["base"]
+                if cached["public"]:
+                    self._public_folder_ids.update(cached_ids.values())
+                return dict(cached_ids)
+            
+            # Some folder was deleted; forget every cached ID of this structure
+            _structure_cache.delete(structure_key)
+            for folder_id in cached_ids.values():
+                _folder_cache.delete_value(folder_id)
+        
         if env_folder_id:
-            print(f"Using folder ID from environment variable: {env_folder_id}")
+            logger.info("Using folder ID from environment variable: %s", env_folder_id)
             base_folder_id = env_folder_id
         else:
             # Create or find the base folder
-            print(f"Creating or finding folder: {base_folder_name}")
+            logger.info("Creating or finding folder: %s", base_folder_name)
             base_folder_id = self._find_or_create_folder(base_folder_name)
         
         self.root_folder_id = base_folder_id
         
-        # Create subfolders
-        summaries_folder_id = self._find_or_create_folder("Summaries", base_folder_id)
-        reports_folder_id = self._find_or_create_folder("Reports", base_folder_id)
-        final_folder_id = self._find_or_create_folder("Final Reports", base_folder_id)
+        # Find or create the subfolders together; a base folder created just
+        # now cannot contain them yet, so they are created without a lookup
+        subfolder_ids = self._find_or_create_folders(
+            ["Summaries", "Reports", "Final Reports"],
+            base_folder_id,
+            lookup=base_folder_id not in self._created_folder_ids
+        )
         
-        return {
+        folder_ids = {
             "base": base_folder_id,
-            "summaries": summaries_folder_id,
-            "reports": reports_folder_id,
-            "final": final_folder_id
+            "summaries": subfolder_ids["Summaries"],
+            "reports": subfolder_ids["Reports"],
+            "final": subfolder_ids["Final Reports"]
         }
+        public = self._is_shared_by_link(base_folder_id)
+        _structure_cache.set(structure_key, {"folder_ids": folder_ids, "public": public})
+        if public:
+            self._public_folder_ids.update(folder_ids.values())
+        return folder_ids
+    
+    def _is_shared_by_link(self, folder_id: str) -> bool:
+        """
+        Check whether a folder is shared with "anyone with the link".
+        
+        Files uploaded under such a folder inherit that access, so they need no
+        permission call of their own.
+        
+        Args:
+            folder_id: ID of the folder to check
+            
+        Returns:
+            True if the folder grants link access; False if not or if unknown
+        """
+        if folder_id in self._created_folder_ids:
+            # A folder created just now has no sharing yet
+            return False
+        
+        try:
+            response = self._execute(self.service.permissions().list(
+                fileId=folder_id,
+                fields='permissions(type, role)'
+            ))
+        except HttpError as error:
+            logger.debug("Could not read permissions of folder %s: %s", folder_id, error)
+            return False
+        
+        if any(p.get('type') == 'anyone' and p.get('role') in ('reader', 'commenter', 'writer')
+               for p in response.get('permissions', [])):
+            logger.info("Folder %s is shared by link; skipping per-file sharing", folder_id)
+            return True
+        return False
+    
+    def needs_sharing(self, folder_id: str) -> bool:
+        """Whether files uploaded to a folder need their own link-sharing permission."""
+        return folder_id not in self._public_folder_ids
+    
+    def _folders_exist(self, folder_ids: List[str]) -> bool:
+        """
+        Check that folders still exist and are not trashed, in one batch request.
+        
+        Args:
+            folder_ids: IDs of the folders to check
+            
+        Returns:
+            True if every folder exists and is not trashed
+        """
+        alive = set()
+        
+        def _on_response(request_id, response, exception):
+            if exception is None and not response.get('trashed'):
+                alive.add(request_id)
+        
+        batch = self.new_batch(callback=_on_response)
+        for folder_id in set(folder_ids):
+            batch.add(self.service.files().get(fileId=folder_id, fields='id, trashed'), request_id=folder_id)
+        
+        try:
+            self._execute(batch)
+        except HttpError as error:
+            logger.warning("Could not verify cached folders: %s", error)
+            return False
+        
+        return alive.issuperset(folder_ids)
+    
+    def new_batch(self, callback=None) -> BatchHttpRequest:
+        """
+        Create a batch request for grouping metadata calls into one HTTP round trip.
+        
+        Media uploads cannot be batched, but follow-up calls such as
+        permissions.create can be added to the batch and executed together.
+        
+        Args:
+            callback: Optional callback invoked as callback(request_id, response, exception)
+            
+        Returns:
+            A new BatchHttpRequest bound to the Drive service
+        """
+        return self.service.new_batch_http_request(callback=callback)
     
-    def upload_file(self, file_path: str, folder_id: str, custom_name: Optional[str] = None) -> Dict[str, Any]:
+    def share_files(self, file_ids: List[str]) -> Dict[str, bool]:
+        """
+        Make several files accessible via link using batched permission requests.
+        
+        Args:
+            file_ids: IDs of the files to share
+            
+        Returns:
+            Dictionary mapping each file ID to whether sharing succeeded
+        """
+        shared = {}
+        
+        def _on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error sharing file %s: %s", request_id, exception)
+            shared[request_id] = exception is None
+        
+        # Drive accepts at most 100 calls per batch request
+        for start in range(0, len(file_ids), 100):
+            chunk = file_ids[start:start + 100]
+            batch = self.new_batch(callback=_on_response)
+            for file_id in chunk:
+                batch.add(
+                    self.service.permissions().create(
+                        fileId=file_id,
+                        body={
+                            'type': 'anyone',
+                            'role': 'reader'
+                        }
+                    ),
+                    request_id=file_id
+                )
+            self._execute(batch, writes=len(chunk))
+        
+        return shared
+    
+    def upload_file(self, file_path: str, folder_id: str, custom_name: Optional[str] = None, share: bool = True, mime_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload a file to Google Drive and make it accessible via link.
         
@@ -199,23 +745,26 @@ class GoogleDriveManager:
             file_path: Path to the file to upload
             folder_id: ID of the folder to upload to
             custom_name: Optional custom name for the file
+            share: Whether to grant link access right away. Pass False when the
+                   caller shares several uploads at once via share_files()
+            mime_type: Optional MIME type; derived from the file extension if omitted
             
         Returns:
             Dictionary with file metadata including ID and webViewLink
+            
+        Raises:
+            FileNotFoundError: If the file does not exist
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
         file_name = custom_name or os.path.basename(file_path)
+        file_ext = os.path.splitext(file_path)[1].lower()
         
         # Check if we should convert markdown to Google Docs
         convert_to_gdoc = False
-        if os.getenv("UPLOAD_GOOGLE_DOCS", "false").lower() == "true":
+        if self.upload_google_docs:
             # Only convert markdown files
-            file_ext = os.path.splitext(file_path)[1].lower()
             if file_ext in ['.md', '.markdown']:
                 convert_to_gdoc = True
-                print(f"Converting {file_path} to Google Docs format")
+                logger.debug("Converting %s to Google Docs format", file_path)
         
         file_metadata = {
             'name': file_name,
@@ -223,44 +772,39 @@ class GoogleDriveManager:
         }
         
         # Determine the MIME type based on file extension
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        if file_ext == '.md':
-            mime_type = 'text/markdown'
-        elif file_ext == '.txt':
-            mime_type = 'text/plain'
-        elif file_ext == '.html':
-            mime_type = 'text/html'
-        elif file_ext in ['.docx', '.doc']:
-            mime_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        else:
-            mime_type = 'application/octet-stream'
+        mime_type = mime_type or _MIME_TYPES.get(file_ext, 'application/octet-stream')
         
         # If converting to Google Docs, set the appropriate parameters
         if convert_to_gdoc:
             file_metadata['mimeType'] = 'application/vnd.google-apps.document'
         
-        media = MediaFileUpload(
-            file_path,
-            mimetype=mime_type,
-            resumable=True
-        )
+        with open(file_path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha1').hexdigest()
+        upload_key = (folder_id, file_name, convert_to_gdoc, digest)
         
         try:
-            file = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, name, webViewLink, mimeType',
-            ).execute()
-            
-            # Set file permissions to "Anyone with the link can view"
-            self.service.permissions().create(
-                fileId=file.get('id'),
-                body={
-                    'type': 'anyone',
-                    'role': 'reader'
-                }
-            ).execute()
+            file = self._find_uploaded(upload_key)
+            if file is None:
+                with _open_media(file_path, mime_type) as media:
+                    file = self._execute(self.service.files().create(
+                        body=file_metadata,
+                        media_body=media,
+                        fields='id, name, webViewLink, mimeType',
+                    ), writes=1)
+                self._uploaded_files[upload_key] = file
+            else:
+                logger.debug("Reusing identical upload of %s: %s", file_path, file.get('id'))
+            
+            # Set file permissions to "Anyone with the link can view", unless
+            # the file already inherits it from its folder
+            if share and self.needs_sharing(folder_id):
+                self._execute(self.service.permissions().create(
+                    fileId=file.get('id'),
+                    body={
+                        'type': 'anyone',
+                        'role': 'reader'
+                    }
+                ), writes=1)
             
             return {
                 'id': file.get('id'),
@@ -272,9 +816,37 @@ class GoogleDriveManager:
             }
             
         except HttpError as error:
-            print(f"Error uploading file: {error}")
+            logger.error("Error uploading file: %s", error)
+            if error.resp.status == 404:
+                # The target folder may have been deleted; forget its cached ID
+                _folder_cache.delete_value(folder_id)
             raise
     
+    def _find_uploaded(self, upload_key: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Get a file this manager already uploaded with the same content, if it still exists.
+        
+        Args:
+            upload_key: Folder ID, file name, conversion flag and content hash of the upload
+            
+        Returns:
+            The files.create response of the earlier upload, or None if there is no live copy
+        """
+        file = self._uploaded_files.get(upload_key)
+        if file is None:
+            return None
+        
+        try:
+            metadata = self._execute(self.service.files().get(fileId=file['id'], fields='id, trashed'))
+            if not metadata.get('trashed'):
+                return file
+        except HttpError as error:
+            if error.resp.status != 404:
+                raise
+        
+        self._uploaded_files.pop(upload_key, None)
+        return None
+    
     def upload_markdown_as_gdoc(self, file_path: str, folder_id: str, custom_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload a markdown file and convert it to Google Docs format.
@@ -298,21 +870,6 @@ class GoogleDriveManager:
         # Upload the file with conversion to Google Docs
         return self.upload_file(file_path, folder_id, custom_name)
     
-    def _sanitize_filename(self, filename: str) -> str:
-        """
-        Sanitize a filename to be safe for Google Drive.
-        
-        Args:
-            filename: Original filename
-            
-        Returns:
-            Sanitized filename
-        """
-        # Replace invalid characters with underscores
-        sanitized = re.sub(r'[\\/*?:"<>|]', "_", filename)
-        # Limit length
-        return sanitized[:100] if len(sanitized) > 100 else sanitized
-    
     def create_custom_filename(self, video_info: Dict[str, Any], file_type: str) -> str:
         """
         Create a custom filename based on video metadata.
@@ -329,40 +886,77 @@ class GoogleDriveManager:
         title = video_info.get('title', 'Unknown')
         channel = video_info.get('channel_title', 'Unknown')
         
-        # Sanitize title and channel
-        safe_title = self._sanitize_filename(title)
-        safe_channel = self._sanitize_filename(channel)
-        
-        return f"{timestamp}_{safe_channel}_{safe_title}_{file_type}.md"
+        # Sanitize the whole name in one pass, then shorten it from the middle so
+        # the "_<type>.md" suffix always survives
+        suffix = f"_{file_type}.md"
+        name = _INVALID_FILENAME_CHARS.sub("_", f"{timestamp}_{channel}_{title}{suffix}")
+        if len(name) > MAX_FILENAME_LENGTH:
+            name = name[:MAX_FILENAME_LENGTH - len(suffix)] + name[-len(suffix):]
+        return name
     
     def upload_analysis_files(self, batch, folder_ids):
-        """Synchronous file upload"""
+        """Upload the files of a batch concurrently on the manager's executor"""
         uploaded = {"summaries": [], "reports": []}
         
+        # Resolve every destination before dispatching, uploading each
+        # (file, folder) pair only once even if it appears in several results
+        tasks = {}
         for result in batch.get_successful_results():
             file_path = result.get("file_path")
             if not file_path:
                 continue
             
-            video_info = result.get("video_info", {})
             analysis_type = result.get("analysis_type", "")
-            
             folder_id = folder_ids["reports" if analysis_type == "report" else "summaries"]
-            custom_name = self.create_custom_filename(video_info, analysis_type)
+            if (file_path, folder_id) in tasks:
+                continue
             
+            tasks[file_path, folder_id] = UploadTask(
+                file_path=file_path,
+                folder_id=folder_id,
+                custom_name=self.create_custom_filename(result.get("video_info", {}), analysis_type),
+                analysis_type=analysis_type,
+                mime_type=_MIME_TYPES.get(os.path.splitext(file_path)[1].lower(), 'application/octet-stream')
+            )
+        
+        # Submit the largest files first so a big upload doesn't start last and
+        # hold up the whole batch (longest-processing-time-first scheduling)
+        ordered = sorted(tasks.values(), key=_file_size, reverse=True)
+        futures = {self.executor.submit(self._upload_task, task): task for task in ordered}
+        
+        completed = []
+        for future in as_completed(futures):
             try:
-                uploaded_file = self.upload_file(file_path, folder_id, custom_name)
-                
-                if analysis_type == "report":
-                    uploaded["reports"].append(uploaded_file)
-                else:
-                    uploaded["summaries"].append(uploaded_file)
-                    
+                completed.append((future.result(), futures[future].analysis_type))
             except Exception as e:
-                print(f"Error uploading file: {e}")
+                logger.error("Error uploading file: %s", e)
+        
+        # Grant link access to every uploaded file in one batched round trip,
+        # skipping files that inherit it from a link-shared folder
+        shared = {}
+        to_share = []
+        for uploaded_file, analysis_type in completed:
+            if self.needs_sharing(folder_ids["reports" if analysis_type == "report" else "summaries"]):
+                to_share.append(uploaded_file['id'])
+            else:
+                shared[uploaded_file['id']] = True
+        if to_share:
+            shared.update(self.share_files(to_share))
+        
+        for uploaded_file, analysis_type in completed:
+            if not shared.get(uploaded_file['id']):
+                continue
+            if analysis_type == "report":
+                uploaded["reports"].append(uploaded_file)
+            else:
+                uploaded["summaries"].append(uploaded_file)
         
         return uploaded
 
+    def _upload_task(self, task: UploadTask) -> Dict[str, Any]:
+        """Upload a prepared task without sharing it."""
+        return self.upload_file(task.file_path, task.folder_id, task.custom_name, share=False, mime_type=task.mime_type)
+
     def upload_final_report(self, final_report, folder_ids):
         """Synchronous final report upload"""
         if final_report.get("status") != "success":
@@ -380,7 +974,7 @@ class GoogleDriveManager:
         try:
             return self.upload_file(file_path, folder_ids["final"], custom_name)
         except Exception as e:
-            print(f"Error uploading final report: {e}")
+            logger.error("Error uploading final report: %s", e)
             return None
     
     def delete_local_files(self, file_metadata_list: List[Dict[str, Any]]) -> List[str]:
@@ -393,20 +987,22 @@ class GoogleDriveManager:
         Returns:
             List of successfully deleted file paths
         """
-        deleted_files = []
+        def _remove(local_path: str) -> bool:
+            try:
+                os.remove(local_path)
+                logger.debug("🗑️ Deleted local file: %s", local_path)
+                return True
+            except FileNotFoundError:
+                return False
+            except Exception as e:
+                logger.error("❌ Error deleting local file %s: %s", local_path, e)
+                return False
         
-        for file_metadata in file_metadata_list:
-            local_path = file_metadata.get("local_path")
-            
-            if local_path and os.path.exists(local_path):
-                try:
-                    os.remove(local_path)
-                    deleted_files.append(local_path)
-                    print(f"🗑️ Deleted local file: {local_path}")
-                except Exception as e:
-                    print(f"❌ Error deleting local file {local_path}: {e}")
+        local_paths = [m.get("local_path") for m in file_metadata_list if m.get("local_path")]
         
-        return deleted_files
+        # Removals are independent, so run them in parallel on the executor
+        removed = self.executor.map(_remove, local_paths)
+        return [local_path for local_path, ok in zip(local_paths, removed) if ok]
 
 if __name__ == "__main__":
     """
@@ -1,8 +1,8 @@
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
-from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel, Field, ValidationError
 from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.exceptions import OutputParserException
+from functools import lru_cache
 import os
 
 class UserQueryParams(BaseModel):
@@ -41,6 +41,55 @@ class UserQueryParams(BaseModel):
         description="Preferred time of day for scheduled analysis (HH:MM format)"
     )
 
+
+# Static instructions come first and the user query last, so every request
+# shares an identical prompt prefix and the prompt needs no template formatting.
+# The output schema is sent through function calling, not in the prompt.
+_PROMPT_PREFIX = """You are an AI assistant that extracts search parameters from user queries about YouTube videos.
+Pay special attention to scheduling requests.
+
+First, determine if this is a scheduling request by looking for keywords like:
+- "schedule", "every day", "every week", "daily", "weekly", "monthly"
+- Time specifications like "at 9am", "every morning", etc.
+
+If it's a scheduling request, extract:
+1. The frequency (daily/weekly/monthly)
+2. Preferred time (in HH:MM format, default to "14:00" if not specified)
+
+For all requests, extract:
+1. The search query for YouTube
+2. A specific video URL if provided
+3. Time frame for the search (default to "24 hours" if not specified)
+4. Minimum view count for filtering (default to 5000 if not specified)
+5. Analysis type (default to "report" if not specified)
+
+Examples:
+"Analyze AI news every week at 9am" ->
+{
+    "query": "AI news",
+    "is_scheduled": true,
+    "schedule_frequency": "weekly",
+    "preferred_time": "09:00"
+}
+
+"Search for machine learning videos from last week" ->
+{
+    "query": "machine learning",
+    "is_scheduled": false,
+    "date_filter": "week"
+}"""
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model: str):
+    """Get the chat model for a model name, bound to return UserQueryParams."""
+    llm = ChatOpenAI(
+        model=model,
+        temperature=0,
+    )
+    return llm.with_structured_output(UserQueryParams)
+
+
 def parse_user_query(user_input: str, model: str = "gpt-4o-mini") -> UserQueryParams:
     """
     Parse a user's natural language query into structured search parameters.
@@ -92,68 +141,12 @@ def parse_user_query(user_input: str, model: str = "gpt-4o-mini") -> UserQueryPa
     print("\n==== Parsing User Query ====")
     print(f"Input text: {user_input}")
     
-    # Initialize the parser with our Pydantic model
-    parser = PydanticOutputParser(pydantic_object=UserQueryParams)
-    
-    # Create the prompt template
-    template = """You are an AI assistant that extracts search parameters from user queries about YouTube videos.
-Pay special attention to scheduling requests.
-
-USER QUERY: {query}
-
-First, determine if this is a scheduling request by looking for keywords like:
-- "schedule", "every day", "every week", "daily", "weekly", "monthly"
-- Time specifications like "at 9am", "every morning", etc.
-
-If it's a scheduling request, extract:
-1. The frequency (daily/weekly/monthly)
-2. Preferred time (in HH:MM format, default to "14:00" if not specified)
-
-For all requests, extract:
-1. The search query for YouTube
-2. A specific video URL if provided
-3. Time frame for the search (default to "24 hours" if not specified)
-4. Minimum view count for filtering (default to 5000 if not specified)
-5. Analysis type (default to "report" if not specified)
-
-Examples:
-"Analyze AI news every week at 9am" ->
-{{
-    "query": "AI news",
-    "is_scheduled": true,
-    "schedule_frequency": "weekly",
-    "preferred_time": "09:00"
-}}
-
-"Search for machine learning videos from last week" ->
-{{
-    "query": "machine learning",
-    "is_scheduled": false,
-    "date_filter": "week"
-}}
-
-{format_instructions}"""
-
-    prompt = PromptTemplate(
-        template=template.strip(),
-        input_variables=["query"],
-        partial_variables={"format_instructions": parser.get_format_instructions()}
-    )
-    
-    # Initialize the language model
-    llm = ChatOpenAI(
-        model=model,
-        temperature=0,
-    )
-    
-    # Generate the formatted prompt and get response
-    formatted_prompt = prompt.format(query=user_input)
-    response = llm.invoke(formatted_prompt).content
-    
     # Parse the response into our Pydantic model
     try:
-        params = parser.parse(response)
-    except Exception as e:
+        # Repeated queries are answered from the cache; a copy is returned so
+        # callers can't modify the cached instance
+        params = _parse_cached(user_input, model).model_copy()
+    except (OutputParserException, ValidationError) as e:
         # Fallback to default values if parsing fails
         print(f"Error parsing query parameters: {e}")
         params = UserQueryParams(query=user_input)
@@ -162,6 +155,23 @@ Examples:
     print(f"Parsed parameters: URL={params.url}, Query={params.query}, Analysis={params.analysis_type}, Date={params.date_filter}, Views={params.views_filter}, Scheduled={params.is_scheduled}")
     
     return params
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(user_input: str, model: str) -> UserQueryParams:
+    """
+    Run the LLM parse of a query, memoized per (query, model).
+    
+    Parse failures raise, and exceptions are not cached, so a query that
+    failed once is retried on the next call.
+    """
+    # The model returns the parameters as a function call validated into UserQueryParams
+    params = _get_llm(model).invoke(f"{_PROMPT_PREFIX}\n\nUSER QUERY: {user_input}")
+    if params is None:
+        # The model answered without calling the function
+        raise OutputParserException(f"No structured output for query: {user_input!r}")
+    return params
+
     
 if __name__ == "__main__":
     # Test regular queries
@@ -1,13 +1,171 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from pathlib import Path
+import io
+import logging
 import os
+import re
+import hashlib
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from langchain_core.prompts import PromptTemplate
+import tiktoken
+
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 
+from app.utils.json_cache import JsonFileCache
+
+# Output directories of the individual analyses
+_ANALYSIS_DIRS = frozenset(("report", "summary"))
+
+# Closes every analysis section of the prompt
+_ANALYSIS_SEPARATOR = "\n\n" + "=" * 50 + "\n"
+
+# Characters dropped from a query to use it in a file name: anything but
+# letters, digits, spaces, hyphens and underscores
+_UNSAFE_QUERY_CHARS_RE = re.compile(r"[^\w \-]")
+
+# Output directory of the final reports
+FINAL_REPORT_DIR = Path("docs") / "final"
+
+# Generated reports keyed by their inputs, so reruns over unchanged analyses
+# skip the LLM entirely
+REPORT_CACHE_DIR = Path("docs") / "cache"
+
+# Video overlap (Jaccard similarity of video URLs) with the previous report
+# for the same query above which that report is updated with only the new
+# videos instead of being regenerated. It is reused as is only when the
+# videos are the same
+REPORT_UPDATE_SIMILARITY = 0.8
+
+# Videos and cached report of the latest final report per user and query, so
+# scheduled reruns whose videos mostly overlap can build on it. Kept next to
+# the cached reports it points into
+_report_history = JsonFileCache("final_report_history", directory=REPORT_CACHE_DIR)
+
+# Token budgets for analysis content sent to the LLM: a cap per analysis and
+# a total shared by all analyses of a batch, well inside the context window.
+# Batches over the total are condensed per analysis first (map-reduce) rather
+# than truncated to fit
+MAX_ANALYSIS_TOKENS = 8000
+MAX_ANALYSES_TOKENS = 60000
+
+# Share of a truncated analysis kept from its beginning; the rest is its end
+TRUNCATE_HEAD_RATIO = 0.7
+TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+# Summaries over at most this many input tokens are synthesized with a
+# smaller, cheaper model
+SMALL_MODEL_MAX_TOKENS = 4000
+SMALL_MODEL = os.getenv("FINAL_REPORT_SMALL_MODEL", "gpt-4.1-nano")
+
+# Maximum number of analysis files read concurrently
+FILE_READ_WORKERS = 32
+
+# Condensed notes are merged in groups of this size until few enough remain
+# for the final synthesis call
+REDUCE_GROUP_SIZE = 10
+
+# Maximum number of concurrent LLM calls during the map step
+MAP_MAX_CONCURRENCY = 8
+
+_MAP_TEMPLATE = """
+Condense the following analysis of a YouTube video into at most 300 tokens of
+markdown bullet points, keeping the key arguments, insights, figures and notable
+quotes that are relevant to the query.
+
+QUERY: {query}
+
+VIDEO: {video_title}
+
+ANALYSIS:
+{content}
+
+CONDENSED NOTES:
+"""
+
+_COLLAPSE_TEMPLATE = """
+Merge the following condensed notes on YouTube videos into a single set of
+markdown bullet points of at most 300 tokens, keeping the insights most
+relevant to the query and noting which videos they come from.
+
+QUERY: {query}
+
+NOTES:
+{content}
+
+MERGED NOTES:
+"""
+
+
+_UPDATE_SYSTEM = (
+    "You are an expert content analyst. Update the given markdown {analysis_type} so it also covers "
+    "the new analyses of YouTube videos. Keep its structure and existing insights, integrate new themes, "
+    "takeaways and points of agreement or disagreement, and return the complete updated {analysis_type}."
+)
+
+_UPDATE_HUMAN = (
+    "QUERY: {query}\n\nCURRENT {analysis_type}:\n{prior_report}\n\n"
+    "NEW ANALYSES ({num_videos} videos):\n{analyses}\n\nUPDATED {analysis_type}:"
+)
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query so differently cased or punctuated reruns match."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+def _video_overlap(videos: set, previous: set) -> float:
+    """Jaccard similarity of two sets of video URLs."""
+    union = videos | previous
+    return len(videos & previous) / len(union) if union else 0.0
+
+
+def _analysis_kind(file_path: str) -> Optional[str]:
+    """Get the analysis type of a file from its closest report or summary directory."""
+    for part in reversed(Path(file_path).parts[:-1]):
+        if part in _ANALYSIS_DIRS:
+            return part
+    return None
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Get the tokenizer of a model, falling back to the current OpenAI encoding."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _token_budgets(lengths: List[int], total: int, cap: int) -> List[int]:
+    """
+    Split a total token budget across items.
+
+    Items shorter than their fair share keep their length and the slack is
+    shared among the longer ones, so only the longest items are truncated.
+
+    Args:
+        lengths: Token count of every item
+        total: Total budget for all items
+        cap: Maximum budget of a single item
+
+    Returns:
+        Budget of every item, in the same order
+    """
+    budgets = [0] * len(lengths)
+    remaining = total
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    for position, index in enumerate(order):
+        share = remaining // (len(order) - position)
+        budgets[index] = min(lengths[index], share, cap)
+        remaining -= budgets[index]
+    return budgets
+
+
 class FinalReportGenerator:
     """
     Class for generating consolidated final reports from individual video analyses.
@@ -25,78 +183,247 @@ class FinalReportGenerator:
             model (str): The LLM model to use for report generation
         """
         self.model = model
+        self.logger = logging.getLogger(__name__)
+        # Cached reports are reused for identical inputs, so on reruns this
+        # temperature only varies the first report generated for those inputs
         self.llm = ChatOpenAI(model=model, temperature=0.7)
+        # Condensing is extractive, so it runs deterministically
+        self.map_llm = ChatOpenAI(model=model, temperature=0)
+        
+        # Compose the chains once and reuse them for every report
+        self._chains = {
+            (analysis_type, model): self._create_prompt_template(analysis_type) | self.llm | StrOutputParser()
+            for analysis_type in ("report", "summary")
+        }
+        self._map_chain = PromptTemplate.from_template(_MAP_TEMPLATE) | self.map_llm | StrOutputParser()
+        self._collapse_chain = PromptTemplate.from_template(_COLLAPSE_TEMPLATE) | self.map_llm | StrOutputParser()
+        self._update_chain = ChatPromptTemplate.from_messages([
+            ("system", _UPDATE_SYSTEM),
+            ("human", _UPDATE_HUMAN)
+        ]) | self.llm | StrOutputParser()
+    
+    def _get_chain(self, analysis_type: str, model: str):
+        """Get the synthesis chain of an analysis type for a model, creating it on first use."""
+        key = ("report" if analysis_type == "report" else "summary", model)
+        chain = self._chains.get(key)
+        if chain is None:
+            llm = ChatOpenAI(model=model, temperature=0.7)
+            chain = self._chains[key] = self._create_prompt_template(key[0]) | llm | StrOutputParser()
+        return chain
+
+    def _select_model(self, analysis_type: str, total_tokens: int) -> str:
+        """Route small summaries to the cheaper model and everything else to the default one."""
+        if analysis_type == "summary" and total_tokens <= SMALL_MODEL_MAX_TOKENS:
+            return SMALL_MODEL
+        return self.model
     
-    def _read_file_content(self, file_path: str) -> str:
-        """Read content from a file."""
+    def _read_file_content(self, file_path: str) -> Optional[str]:
+        """Read content from a file, or None if it does not exist."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 return f.read()
+        except FileNotFoundError:
+            self.logger.warning("File not found: %s", file_path)
+            return None
         except Exception as e:
-            print(f"Error reading file {file_path}: {e}")
+            self.logger.error("Error reading file %s: %s", file_path, e)
             return f"[Error reading file: {e}]"
         
-    def _create_prompt_template(self, analysis_type: str) -> PromptTemplate:
-        """Create the appropriate prompt template based on analysis type."""
+    def _create_prompt_template(self, analysis_type: str) -> ChatPromptTemplate:
+        """
+        Create the appropriate prompt template based on analysis type.
+
+        The instructions are a static system message placed before the query
+        and analyses, so repeated calls share the same prompt prefix and can
+        reuse the provider's prompt cache.
+        """
         if analysis_type == "report":
-            template = """
-            You are an expert content analyst tasked with creating a comprehensive consolidated report.
-            
-            ORIGINAL QUERY: {query}
-            
-            You have been provided with analyses of {num_videos} different YouTube videos related to this query.
-            Your task is to synthesize these analyses into a single, cohesive final report that provides
-            a complete picture of the topic across all videos.
-            
-            INDIVIDUAL ANALYSES:
-            {analyses}
-            
-            Create a comprehensive final report that:
-            1. Introduces the topic and provides context
-            2. Synthesizes the main themes, arguments, and insights across all videos
-            3. Highlights areas of consensus and disagreement
-            4. Identifies the most valuable insights and takeaways
-            5. Provides a thoughtful conclusion that addresses the original query
-            
-            Use proper markdown formatting with clear section headers, bullet points where appropriate,
-            and quotes from the original analyses when relevant. Be thorough and insightful while
-            maintaining a professional tone.
-            
-            FINAL REPORT:
-            """
+            system = (
+                "You are an expert content analyst. Synthesize the given analyses of YouTube videos "
+                "into one cohesive markdown report answering the query.\n"
+                "Sections:\n"
+                "- Introduction and context\n"
+                "- Main themes, arguments and insights across videos\n"
+                "- Consensus and disagreement\n"
+                "- Key takeaways\n"
+                "- Conclusion addressing the query\n"
+                "Use headers, bullet points and quotes from the analyses where relevant. Professional tone."
+            )
+            human = "QUERY: {query}\n\nANALYSES ({num_videos} videos):\n{analyses}\n\nFINAL REPORT:"
         else:  # summary
-            template = """
-            You are an expert content analyst tasked with creating a concise consolidated summary.
-            
-            ORIGINAL QUERY: {query}
-            
-            You have been provided with summaries of {num_videos} different YouTube videos related to this query.
-            Your task is to synthesize these summaries into a single, cohesive final summary that captures
-            the essential information across all videos.
-            
-            INDIVIDUAL SUMMARIES:
-            {analyses}
-            
-            Create a focused final summary that:
-            1. Clearly states the core message/theme across all videos
-            2. Presents the most important key takeaways. DO NOT limit yourself to specific amount of points. 
-               Create as many points as you see fit to get a comprehensive overview.
-            3. Highlights areas of consensus in the community
-            4. Directly addresses the original query
-            5. Create a complete summary, don't limit to specific amount of paragraphs. If you need to use multiple steps
-               to explain everything, do it.
-            
-            Use proper markdown formatting with clear section headers and bullet points for key takeaways.
-            Be concise but comprehensive, ensuring no crucial information is lost.
-            
-            FINAL SUMMARY:
-            """
+            system = (
+                "You are an expert content analyst. Synthesize the given summaries of YouTube videos "
+                "into one cohesive markdown summary answering the query.\n"
+                "Include:\n"
+                "- Core message across videos\n"
+                "- All important key takeaways, as many bullet points as needed\n"
+                "- Community consensus\n"
+                "- Direct answer to the query\n"
+                "Use headers and bullet points. Concise but complete: no crucial information lost."
+            )
+            human = "QUERY: {query}\n\nSUMMARIES ({num_videos} videos):\n{analyses}\n\nFINAL SUMMARY:"
         
-        return PromptTemplate(
-            template=template,
-            input_variables=["query", "analyses", "num_videos"]
-        )
+        return ChatPromptTemplate.from_messages([
+            ("system", system),
+            ("human", human)
+        ])
     
+    def _cache_key(self, query: str, analysis_type: str, analysis_content: List[Dict[str, Any]]) -> str:
+        """Hash the model, query, analysis type and the set of analysis contents."""
+        content_hashes = sorted(
+            hashlib.sha256(analysis["content"].encode("utf-8")).hexdigest()
+            for analysis in analysis_content
+        )
+        key = hashlib.blake2b(digest_size=16)
+        for part in (self.model, query, analysis_type, *content_hashes):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def _truncate_analyses(self, analysis_content: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fit the analyses into the token budgets.
+
+        Oversized analyses keep their beginning and end, joined by a
+        truncation marker, since introductions and conclusions carry most of
+        their substance. Analyses over the total budget are only held to the
+        per-analysis cap, as they are condensed one by one before synthesis.
+
+        Args:
+            analysis_content: Analyses as returned by collect_analysis_files
+
+        Returns:
+            Tuple of the analyses in the same shape, truncated where needed, and
+            their total token count before truncation
+        """
+        encoding = _get_encoding(self.model)
+        tokens = [encoding.encode(analysis["content"]) for analysis in analysis_content]
+        lengths = [len(t) for t in tokens]
+        total_tokens = sum(lengths)
+        if total_tokens > MAX_ANALYSES_TOKENS:
+            budgets = [min(length, MAX_ANALYSIS_TOKENS) for length in lengths]
+        else:
+            budgets = _token_budgets(lengths, MAX_ANALYSES_TOKENS, MAX_ANALYSIS_TOKENS)
+
+        truncated = []
+        for analysis, analysis_tokens, budget in zip(analysis_content, tokens, budgets):
+            if len(analysis_tokens) <= budget:
+                truncated.append(analysis)
+                continue
+            head = int(budget * TRUNCATE_HEAD_RATIO)
+            tail = budget - head
+            content = (
+                encoding.decode(analysis_tokens[:head])
+                + TRUNCATION_MARKER
+                + encoding.decode(analysis_tokens[len(analysis_tokens) - tail:])
+            )
+            self.logger.info(
+                "Truncated %s from %d to %d tokens", analysis['video_title'], len(analysis_tokens), budget
+            )
+            truncated.append({**analysis, "content": content})
+
+        return truncated, total_tokens
+
+    def _previous_report(self, history_key: str, videos: set) -> Optional[Dict[str, Any]]:
+        """
+        Find the previous final report for the same user, query and analysis type.
+
+        Args:
+            history_key: Key of the user, query and analysis type in the report history
+            videos: URLs of the videos of the current run
+
+        Returns:
+            Dictionary with the previous report content, its video URLs and their
+            overlap with the current videos, or None if there is none
+        """
+        entry = _report_history.get(history_key)
+        if not entry:
+            return None
+        try:
+            content = (REPORT_CACHE_DIR / entry["cache_file"]).read_text(encoding='utf-8')
+        except OSError:
+            # The cached report is gone; drop the entry pointing to it
+            _report_history.delete(history_key)
+            return None
+        previous_videos = set(entry["videos"])
+        return {
+            "content": content,
+            "videos": previous_videos,
+            "overlap": _video_overlap(videos, previous_videos)
+        }
+
+    @staticmethod
+    def _stream_to_file(chain, inputs: Dict[str, Any], output_file: Path,
+                        on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Run a chain, writing its output to a file as it streams in."""
+        pieces = []
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for chunk in chain.stream(inputs):
+                f.write(chunk)
+                pieces.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+        return "".join(pieces)
+
+    @staticmethod
+    def _format_analyses(analysis_content: List[Dict[str, Any]]) -> str:
+        """Format analyses as numbered sections for a prompt in a single pass."""
+        buffer = io.StringIO()
+        for i, analysis in enumerate(analysis_content, 1):
+            if i > 1:
+                buffer.write("\n")
+            buffer.write(f"ANALYSIS {i}: {analysis['video_title']}\nURL: {analysis['video_url']}\n\n")
+            buffer.write(analysis['content'])
+            buffer.write(_ANALYSIS_SEPARATOR)
+        return buffer.getvalue()
+
+    def _condense_analyses(self, analysis_content: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+        """
+        Map step: condense every analysis into short notes in parallel.
+
+        When the notes are still too many for one synthesis call they are merged
+        group by group (tree reduction) until at most REDUCE_GROUP_SIZE remain.
+
+        Args:
+            analysis_content: Analyses as returned by collect_analysis_files
+            query: The original search query
+
+        Returns:
+            Analyses in the same shape with their content replaced by the notes
+        """
+        config = {"max_concurrency": MAP_MAX_CONCURRENCY}
+        notes = self._map_chain.batch(
+            [
+                {"query": query, "video_title": analysis["video_title"], "content": analysis["content"]}
+                for analysis in analysis_content
+            ],
+            config=config
+        )
+        condensed = [
+            {**analysis, "content": note}
+            for analysis, note in zip(analysis_content, notes)
+        ]
+
+        while len(condensed) > REDUCE_GROUP_SIZE:
+            groups = [
+                condensed[i:i + REDUCE_GROUP_SIZE]
+                for i in range(0, len(condensed), REDUCE_GROUP_SIZE)
+            ]
+            merged = self._collapse_chain.batch(
+                [{"query": query, "content": self._format_analyses(group)} for group in groups],
+                config=config
+            )
+            condensed = [
+                {
+                    "video_title": "; ".join(a["video_title"] for a in group),
+                    "video_url": ", ".join(a["video_url"] for a in group),
+                    "content": note
+                }
+                for group, note in zip(groups, merged)
+            ]
+
+        return condensed
+
     def collect_analysis_files(self, batch_results: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
         """
         Collect all analysis files from a batch processing run.
@@ -112,16 +439,17 @@ class FinalReportGenerator:
         
         # Check if batch_results is a BatchResults object
         if hasattr(batch_results, 'get_successful_results'):
-            print("Processing BatchResults object")
+            self.logger.debug("Processing BatchResults object")
             results = batch_results.get_successful_results()
         else:
             # Handle dictionary case
-            print("Processing dictionary results")
+            self.logger.debug("Processing dictionary results")
             results = batch_results.get("results", [])
         
-        print(f"Found {len(results)} results to process")
+        self.logger.debug("Found %d results to process", len(results))
         
-        # Process each result
+        # Gather the files of every result first so they can be read concurrently
+        pending = []
         for result in results:
             if result.get("status") != "success":
                 continue
@@ -129,7 +457,9 @@ class FinalReportGenerator:
             # Get file paths from the file_paths list
             file_paths = result.get("file_paths", [])
             if not file_paths:
-                print(f"No file paths found in result: {result.get('metadata', {}).get('title', 'Unknown')}")
+                self.logger.warning(
+                    "No file paths found in result: %s", result.get('metadata', {}).get('title', 'Unknown')
+                )
                 continue
             
             # Get video info
@@ -137,31 +467,48 @@ class FinalReportGenerator:
             video_title = video_info.get("title") or result.get("metadata", {}).get("title", "Unknown")
             video_url = video_info.get("url") or result.get("video_url", "")
             
-            # Process each file path
             for file_path in file_paths:
-                if not file_path or not os.path.exists(file_path):
-                    print(f"File not found or invalid path: {file_path}")
+                kind = _analysis_kind(file_path) if file_path else None
+                if kind is None:
+                    self.logger.warning("Invalid analysis file path: %s", file_path)
                     continue
-                
-                print(f"Reading file: {file_path}")
-                content = self._read_file_content(file_path)
-                
-                file_info = {
-                    "video_title": video_title,
-                    "video_url": video_url,
-                    "file_path": file_path,
-                    "content": content
-                }
-                
-                # Categorize as report or summary
-                if "/report/" in file_path:
-                    reports.append(file_info)
-                    print(f"Added as report: {file_path}")
-                elif "/summary/" in file_path:
-                    summaries.append(file_info)
-                    print(f"Added as summary: {file_path}")
+                pending.append((file_path, kind, video_title, video_url))
+        
+        # File reads are I/O bound, so a thread pool overlaps their latency.
+        # Missing files surface as failed opens rather than separate stat calls
+        with ThreadPoolExecutor(max_workers=min(FILE_READ_WORKERS, len(pending) or 1)) as executor:
+            contents = list(executor.map(self._read_file_content, [p[0] for p in pending]))
+        
+        # Process each file in its original order, skipping exact duplicates
+        # such as the same transcript republished by another channel
+        seen = set()
+        for (file_path, kind, video_title, video_url), content in zip(pending, contents):
+            if content is None:
+                continue
+            self.logger.debug("Read file: %s", file_path)
+            
+            digest = (kind, hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest())
+            if digest in seen:
+                self.logger.info("Skipping duplicate %s content: %s", kind, file_path)
+                continue
+            seen.add(digest)
+            
+            file_info = {
+                "video_title": video_title,
+                "video_url": video_url,
+                "file_path": file_path,
+                "content": content
+            }
+            
+            # Categorize as report or summary
+            if kind == "report":
+                reports.append(file_info)
+                self.logger.debug("Added as report: %s", file_path)
+            else:
+                summaries.append(file_info)
+                self.logger.debug("Added as summary: %s", file_path)
         
-        print(f"Collected {len(reports)} reports and {len(summaries)} summaries")
+        self.logger.info("Collected %d reports and %d summaries", len(reports), len(summaries))
         
         return {
             "reports": reports,
@@ -171,14 +518,21 @@ class FinalReportGenerator:
     def generate_final_report(self, 
                              batch_results: Dict[str, Any], 
                              query: str, 
-                             analysis_type: str = "report") -> Dict[str, Any]:
+                             analysis_type: str = "report",
+                             on_chunk: Optional[Callable[[str], None]] = None,
+                             user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a final consolidated report from individual analyses.
         
+        The report is written to its output file as the LLM streams it.
+        
         Args:
             batch_results: BatchResults object or dictionary with results metadata
             query: The original search query
             analysis_type: Type of analysis ("report" or "summary")
+            on_chunk: Optional callback receiving each piece of the report as it is generated
+            user_id: Optional ID of the user the report is for. Previous reports
+                     are only built on for the same user
             
         Returns:
             Dictionary with the final report content and metadata
@@ -203,41 +557,96 @@ class FinalReportGenerator:
                 "content": "Could not generate final report: No analysis files found."
             }
         
-        # Create prompt for final report generation
-        prompt_template = self._create_prompt_template(analysis_type)
+        # Create output file path
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        safe_query = _UNSAFE_QUERY_CHARS_RE.sub("", query).strip()[:30]
+        filename = f"{timestamp}_{safe_query}_final_{analysis_type}.md"
         
-        # Format the analyses for the prompt
-        formatted_analyses = []
-        for i, analysis in enumerate(analysis_content, 1):
-            formatted_analyses.append(
-                f"ANALYSIS {i}: {analysis['video_title']}\n"
-                f"URL: {analysis['video_url']}\n\n"
-                f"{analysis['content']}\n\n"
-                f"{'=' * 50}\n"
-            )
+        FINAL_REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        output_file = FINAL_REPORT_DIR / filename
         
-        analyses_text = "\n".join(formatted_analyses)
+        # Model that generated the report; stays None when it comes from a cache
+        model_used = None
         
-        # Generate the final report
-        chain = prompt_template | self.llm | StrOutputParser()
-        final_report = chain.invoke({
-            "query": query,
-            "analyses": analyses_text,
-            "num_videos": len(analysis_content)
-        })
+        # Reuse the report generated earlier for exactly the same inputs
+        cache_file = REPORT_CACHE_DIR / f"{self._cache_key(query, analysis_type, analysis_content)}.md"
+        try:
+            final_report = cache_file.read_text(encoding='utf-8')
+            self.logger.info("Using cached final %s: %s", analysis_type, cache_file)
+        except OSError:
+            final_report = None
         
-        # Create output file path
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe_query = "".join(c for c in query if c.isalnum() or c in " -_").strip()[:30]
-        filename = f"{timestamp}_{safe_query}_final_{analysis_type}.md"
+        # Otherwise build on the user's previous report for the same query when
+        # the videos mostly overlap, as with scheduled reruns
+        videos = {analysis["video_url"] for analysis in analysis_content}
+        history_key = f"{user_id}:{analysis_type}:{_normalize_query(query)}" if user_id else None
+        previous = None
+        if final_report is None and history_key is not None:
+            previous = self._previous_report(history_key, videos)
         
-        output_dir = Path("docs") / "final"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = output_dir / filename
+        new_content = []
+        if previous is not None:
+            if previous["videos"] == videos:
+                self.logger.info("Reusing previous final %s for the same videos", analysis_type)
+                final_report = previous["content"]
+            elif previous["overlap"] >= REPORT_UPDATE_SIMILARITY:
+                # With no new videos the previous report covers videos this run
+                # did not analyze, so it is regenerated instead of updated
+                new_content = [a for a in analysis_content if a["video_url"] not in previous["videos"]]
         
-        # Save the final report
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(final_report)
+        if final_report is not None:
+            # Save the cached final report
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(final_report)
+            if on_chunk is not None:
+                on_chunk(final_report)
+        else:
+            if new_content:
+                # Only the new videos are analyzed, on top of the previous report
+                self.logger.info("Updating previous final %s with %d new videos", analysis_type, len(new_content))
+                prompt_content, total_tokens = self._truncate_analyses(new_content)
+                model_used = self.model
+            else:
+                prompt_content, total_tokens = self._truncate_analyses(analysis_content)
+                model_used = self._select_model(analysis_type, total_tokens)
+            
+            # Condense batches over the token budget in parallel so the synthesis
+            # call gets short intermediates instead of one huge prompt; smaller
+            # batches are synthesized from the full analyses in a single call
+            if total_tokens > MAX_ANALYSES_TOKENS:
+                prompt_content = self._condense_analyses(prompt_content, query)
+            
+            # Format the analyses for the prompt
+            analyses_text = self._format_analyses(prompt_content)
+            
+            # Generate the final report, saving it as it streams in
+            if new_content:
+                final_report = self._stream_to_file(self._update_chain, {
+                    "query": query,
+                    "analysis_type": "report" if analysis_type == "report" else "summary",
+                    "prior_report": previous["content"],
+                    "analyses": analyses_text,
+                    "num_videos": len(new_content)
+                }, output_file, on_chunk)
+            else:
+                final_report = self._stream_to_file(
+                    self._get_chain(analysis_type, model_used),
+                    {
+                        "query": query,
+                        "analyses": analyses_text,
+                        "num_videos": len(analysis_content)
+                    },
+                    output_file,
+                    on_chunk
+                )
+            
+            try:
+                REPORT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(final_report, encoding='utf-8')
+                if history_key is not None:
+                    _report_history.set(history_key, {"videos": sorted(videos), "cache_file": cache_file.name})
+            except OSError as e:
+                self.logger.warning("Could not cache final %s: %s", analysis_type, e)
         
         return {
             "status": "success",
@@ -245,7 +654,8 @@ class FinalReportGenerator:
             "file_path": str(output_file),
             "analysis_type": analysis_type,
             "query": query,
-            "num_videos": len(analysis_content)
+            "num_videos": len(analysis_content),
+            "model": model_used
         }
     
 if __name__ == "__main__":
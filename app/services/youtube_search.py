@@ -1,9 +1,45 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 import os
-from googleapiclient.discovery import build
+from operator import itemgetter
 from googleapiclient.errors import HttpError
 from app.crew.tools.youtube_tools import extract_video_id
+from app.utils.google_clients import get_youtube_client, YOUTUBE_NUM_RETRIES
+from app.utils.json_cache import JsonFileCache
+
+# Seconds per designator in the time part of an ISO 8601 duration ('PT1H30M15S')
+_DURATION_UNITS = {'H': 3600, 'M': 60, 'S': 1}
+
+# Days covered by each recognized date filter
+_DATE_FILTER_DAYS = {
+    "24 hours": 1, "today": 1,
+    "week": 7, "this week": 7, "last week": 7,
+    "month": 30, "this month": 30, "last month": 30,
+    "year": 365, "this year": 365, "last year": 365,
+}
+
+# Partial responses: only the fields that are read from each API response
+_SEARCH_FIELDS = "items(id(kind,videoId),snippet(title,channelTitle,publishedAt,description))"
+_VIDEO_DETAILS_FIELDS = (
+    "etag,items(id,statistics(viewCount,likeCount,commentCount,favoriteCount),contentDetails/duration)"
+)
+_VIDEO_FIELDS = (
+    "items(snippet(title,channelTitle,publishedAt,description),"
+    "statistics(viewCount,likeCount,commentCount),contentDetails/duration)"
+)
+
+# Video details and search results persisted across runs, so repeated and
+# scheduled searches skip the API for recently fetched data
+VIDEO_DETAILS_CACHE_TTL = int(os.getenv("YOUTUBE_VIDEO_DETAILS_CACHE_TTL", 24 * 3600))
+SEARCH_CACHE_TTL = int(os.getenv("YOUTUBE_SEARCH_CACHE_TTL", 3600))
+_video_details_cache = JsonFileCache("youtube_video_details", ttl=VIDEO_DETAILS_CACHE_TTL)
+_search_cache = JsonFileCache("youtube_searches", ttl=SEARCH_CACHE_TTL)
+_video_cache = JsonFileCache("youtube_videos", ttl=VIDEO_DETAILS_CACHE_TTL)
+
+# ETag and details of the last videos.list response per set of IDs, used to
+# revalidate expired details with conditional requests
+VIDEO_LIST_ETAG_TTL = 7 * 24 * 3600
+_video_list_etags = JsonFileCache("youtube_video_list_etags", ttl=VIDEO_LIST_ETAG_TTL)
 
 
 class YouTubeSearch:
@@ -37,6 +73,11 @@ class YouTubeSearch:
         if not self.api_key:
             raise ValueError("YouTube API key is required. Set YOUTUBE_API_KEY environment variable or pass it to the constructor.")
     
+    @property
+    def youtube(self):
+        """YouTube Data API client of the current thread, reused across requests."""
+        return get_youtube_client(self.api_key)
+    
     def _convert_date_filter_to_published_after(self, date_filter: str) -> str:
         """
         Convert a date filter string to an ISO 8601 datetime string.
@@ -58,17 +99,16 @@ class YouTubeSearch:
         # Replace deprecated datetime.utcnow() with timezone-aware alternative
         now = datetime.now(timezone.utc)
         
-        if date_filter == "24 hours" or date_filter.lower() == "today":
-            published_after = now - timedelta(days=1)
-        elif date_filter.lower() in ["week", "this week", "last week"]:
-            published_after = now - timedelta(days=7)
-        elif date_filter.lower() in ["month", "this month", "last month"]:
-            published_after = now - timedelta(days=30)
-        elif date_filter.lower() in ["year", "this year", "last year"]:
-            published_after = now - timedelta(days=365)
+        # Default to 24 hours if the date filter is not recognized
+        days = _DATE_FILTER_DAYS.get(date_filter.lower(), 1)
+        
+        # Round down so repeated searches within the same minute (24 hours) or
+        # hour (longer windows) send identical requests
+        if days > 1:
+            now = now.replace(minute=0, second=0, microsecond=0)
         else:
-            # Default to 24 hours if the date filter is not recognized
-            published_after = now - timedelta(days=1)
+            now = now.replace(second=0, microsecond=0)
+        published_after = now - timedelta(days=days)
             
         return published_after.isoformat()
     
@@ -82,19 +122,23 @@ class YouTubeSearch:
         Returns:
             int: Duration in seconds
         """
-        import re
-        import datetime
-        
-        # Extract hours, minutes, seconds from ISO 8601 duration
-        hours = re.search(r'(\d+)H', duration)
-        minutes = re.search(r'(\d+)M', duration)
-        seconds = re.search(r'(\d+)S', duration)
-        
-        hours = int(hours.group(1)) if hours else 0
-        minutes = int(minutes.group(1)) if minutes else 0
-        seconds = int(seconds.group(1)) if seconds else 0
+        # Single scan: accumulate each number and add it on its designator.
+        # Only the time part (after 'T') counts. The date part is ignored on
+        # purpose: the previous regexes read the 'M' of a month ('P1M') as
+        # minutes, which this parser no longer does
+        total = number = 0
+        in_time = False
+        for char in duration:
+            if '0' <= char <= '9':
+                number = number * 10 + ord(char) - 48
+                continue
+            if char == 'T':
+                in_time = True
+            elif in_time and char in _DURATION_UNITS:
+                total += number * _DURATION_UNITS[char]
+            number = 0
         
-        return hours * 3600 + minutes * 60 + seconds
+        return total
     
     
     def search_videos(self, query: str, date_filter: str = "24 hours", 
@@ -103,7 +147,8 @@ class YouTubeSearch:
         Search for YouTube videos based on query and date filter.
         
         This method searches YouTube for videos matching the specified query
-        and published after the date determined by the date filter.
+        and published after the date determined by the date filter. Results are
+        cached on disk for SEARCH_CACHE_TTL seconds.
         
         Args:
             query (str): Search query for finding videos
@@ -117,40 +162,44 @@ class YouTubeSearch:
         Raises:
             HttpError: If there's an error with the YouTube API request
         """
+        cache_key = f"{query}\0{date_filter}\0{video_duration}\0{self.YOUTUBE_SEARCH_MAX_RESULTS}"
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            # Copies, since callers add details to the returned dictionaries
+            return [dict(video) for video in cached]
+        
         try:
-            youtube = build('youtube', 'v3', developerKey=self.api_key)
-            
             # Convert date filter to publishedAfter parameter
             published_after = self._convert_date_filter_to_published_after(date_filter)
             
             # Execute search request
-            search_response = youtube.search().list(
+            search_response = self.youtube.search().list(
                 q=query,
                 part="snippet",
                 type="video",
                 videoDuration=video_duration,  # Add duration filter
                 order="relevance",
                 publishedAfter=published_after,
-                maxResults=self.YOUTUBE_SEARCH_MAX_RESULTS
-            ).execute()
+                maxResults=self.YOUTUBE_SEARCH_MAX_RESULTS,
+                fields=_SEARCH_FIELDS
+            ).execute(num_retries=YOUTUBE_NUM_RETRIES)
             
             # Extract video information from search results
-            videos = []
-            for item in search_response.get("items", []):
-                if item["id"]["kind"] == "youtube#video":
-                    video_id = item["id"]["videoId"]
-                    snippet = item["snippet"]
-                    
-                    videos.append({
-                        "id": video_id,
-                        "url": f"https://www.youtube.com/watch?v={video_id}",
-                        "title": snippet["title"],
-                        "channel_title": snippet["channelTitle"],
-                        "published_at": snippet["publishedAt"],
-                        "description": snippet["description"],
-                    })
+            videos = [
+                {
+                    "id": (video_id := item["id"]["videoId"]),
+                    "url": f"https://www.youtube.com/watch?v={video_id}",
+                    "title": (snippet := item["snippet"])["title"],
+                    "channel_title": snippet["channelTitle"],
+                    "published_at": snippet["publishedAt"],
+                    "description": snippet["description"],
+                }
+                for item in search_response.get("items", ())
+                if item["id"]["kind"] == "youtube#video"
+            ]
             
-            return videos
+            _search_cache.set(cache_key, videos)
+            return [dict(video) for video in videos]
             
         except HttpError as e:
             print(f"An HTTP error occurred: {e}")
@@ -161,7 +210,8 @@ class YouTubeSearch:
         Get combined statistics and content details for a list of video IDs.
         
         This method combines what was previously separate calls for statistics and duration
-        into a single API call to reduce API usage costs.
+        into a single API call to reduce API usage costs. Details fetched within the last
+        VIDEO_DETAILS_CACHE_TTL seconds are served from a disk cache instead.
         
         Args:
             video_ids (List[str]): List of YouTube video IDs
@@ -183,44 +233,82 @@ class YouTubeSearch:
         Raises:
             HttpError: If there's an error with the YouTube API request
         """
+        # Serve recently fetched videos from the cache and only request the rest
+        all_details = {}
+        missing_ids = []
+        for video_id in video_ids:
+            cached = _video_details_cache.get(video_id)
+            if cached is not None:
+                all_details[video_id] = dict(cached)
+            else:
+                missing_ids.append(video_id)
+        
+        # Split video IDs into chunks of 50 (API limit)
+        video_id_chunks = [missing_ids[i:i+50] for i in range(0, len(missing_ids), 50)]
+        
+        # Search results never exceed 50 videos, so this is a single request in
+        # practice; a failed chunk does not discard the others
+        fetched = {}
+        for chunk in video_id_chunks:
+            try:
+                fetched.update(self._fetch_video_details(chunk))
+            except HttpError as e:
+                print(f"An HTTP error occurred: {e}")
+        
+        # Cache whatever was fetched, even if some chunks failed
+        _video_details_cache.set_many(fetched)
+        all_details.update((video_id, dict(details)) for video_id, details in fetched.items())
+        return all_details
+    
+    def _fetch_video_details(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the details of up to 50 videos in one videos.list request.
+
+        The request is conditional on the ETag of the previous response for the
+        same IDs, so unchanged results come back as an empty 304 and are reused.
+
+        Args:
+            video_ids (List[str]): Up to 50 YouTube video IDs
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Dictionary mapping video IDs to their details
+        """
+        etag_key = ",".join(video_ids)
+        previous = _video_list_etags.get(etag_key)
+        
+        # Execute videos list request with both statistics and contentDetails parts
+        request = self.youtube.videos().list(
+            part="statistics,contentDetails",
+            id=etag_key,
+            fields=_VIDEO_DETAILS_FIELDS
+        )
+        if previous is not None:
+            request.headers["If-None-Match"] = previous["etag"]
         try:
-            youtube = build('youtube', 'v3', developerKey=self.api_key)
-            
-            # Split video IDs into chunks of 50 (API limit)
-            video_id_chunks = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
-            
-            all_details = {}
-            for chunk in video_id_chunks:
-                # Execute videos list request with both statistics and contentDetails parts
-                videos_response = youtube.videos().list(
-                    part="statistics,contentDetails",
-                    id=",".join(chunk)
-                ).execute()
-                
-                # Extract details for each video
-                for item in videos_response.get("items", []):
-                    video_id = item["id"]
-                    statistics = item["statistics"]
-                    content_details = item["contentDetails"]
-                    
-                    # Parse duration
-                    duration_str = content_details["duration"]
-                    duration_seconds = self._parse_duration_to_seconds(duration_str)
-                    
-                    all_details[video_id] = {
-                        "view_count": int(statistics.get("viewCount", 0)),
-                        "like_count": int(statistics.get("likeCount", 0)),
-                        "comment_count": int(statistics.get("commentCount", 0)),
-                        "favorite_count": int(statistics.get("favoriteCount", 0)),
-                        "duration": duration_str,
-                        "duration_seconds": duration_seconds
-                    }
-            
-            return all_details
-            
+            videos_response = request.execute(num_retries=YOUTUBE_NUM_RETRIES)
         except HttpError as e:
-            print(f"An HTTP error occurred: {e}")
-            return {}
+            if previous is not None and e.resp.status == 304:
+                _video_list_etags.set(etag_key, previous)
+                return previous["details"]
+            raise
+        
+        # Extract details for each video
+        parse_duration = self._parse_duration_to_seconds
+        details = {
+            item["id"]: {
+                "view_count": int((statistics := item["statistics"]).get("viewCount", 0)),
+                "like_count": int(statistics.get("likeCount", 0)),
+                "comment_count": int(statistics.get("commentCount", 0)),
+                "favorite_count": int(statistics.get("favoriteCount", 0)),
+                "duration": (duration_str := item["contentDetails"]["duration"]),
+                "duration_seconds": parse_duration(duration_str)
+            }
+            for item in videos_response.get("items", ())
+        }
+        
+        if videos_response.get("etag"):
+            _video_list_etags.set(etag_key, {"etag": videos_response["etag"], "details": details})
+        return details
     
     def filter_videos(self, videos: List[Dict[str, Any]], min_views: int = 5000, 
                      min_duration_seconds: int = 9000) -> List[Dict[str, Any]]:
@@ -248,33 +336,35 @@ class YouTubeSearch:
         
         # Filter videos by both view count and duration
         filtered_videos = []
-        for video in videos:
-            video_id = video["id"]
-            if video_id in details:
-                video_details = details[video_id]
+        append = filtered_videos.append
+        for video_id, video in zip(video_ids, videos):
+            video_details = details.get(video_id)
+            
+            # Only include videos with enough views AND sufficient duration
+            if (video_details is not None and
+                video_details["view_count"] >= min_views and 
+                video_details["duration_seconds"] >= min_duration_seconds):
                 
-                # Only include videos with enough views AND sufficient duration
-                if (video_details["view_count"] >= min_views and 
-                    video_details["duration_seconds"] >= min_duration_seconds):
-                    
-                    # Add details to video metadata
-                    video.update({
-                        "view_count": video_details["view_count"],
-                        "like_count": video_details["like_count"],
-                        "comment_count": video_details["comment_count"],
-                        "duration": video_details["duration"],
-                        "duration_seconds": video_details["duration_seconds"]
-                    })
-                    filtered_videos.append(video)
+                # Add details to video metadata
+                video.update({
+                    "view_count": video_details["view_count"],
+                    "like_count": video_details["like_count"],
+                    "comment_count": video_details["comment_count"],
+                    "duration": video_details["duration"],
+                    "duration_seconds": video_details["duration_seconds"]
+                })
+                append(video)
         
         # Sort by view count (descending)
-        filtered_videos.sort(key=lambda x: x["view_count"], reverse=True)
+        filtered_videos.sort(key=itemgetter("view_count"), reverse=True)
         
         return filtered_videos
     
     def search_and_filter(self, query: str, date_filter: str = "24 hours", 
                          min_views: int = 5000, max_results: int = 3,
-                         exclude_video_ids: List[str] = None) -> List[Dict[str, Any]]:
+                         exclude_video_ids: List[str] = None,
+                         min_duration_minutes: Optional[int] = None,
+                         max_duration_hours: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Search for videos and filter by view count and duration in one operation.
         
@@ -287,20 +377,34 @@ class YouTubeSearch:
             min_views (int): Minimum view count for filtering (default: 5000)
             max_results (int): Maximum number of final results to return (default: 3)
             exclude_video_ids (List[str]): List of video IDs to exclude from results
+            min_duration_minutes (Optional[int]): Minimum video duration in minutes.
+                                                 Defaults to MIN_DURATION_MINUTES
+            max_duration_hours (Optional[float]): Maximum video duration in hours.
+                                                 Defaults to MAX_DURATION_MINUTES
             
         Returns:
             List[Dict[str, Any]]: Filtered list of video metadata dictionaries
         """
-        # Get search results sorted by relevance
+        # Get search results sorted by relevance, without already processed videos
         search_results = self.search_videos(query, date_filter, video_duration="any")
+        if exclude_video_ids:
+            exclude_set = set(exclude_video_ids)
+            search_results = [video for video in search_results if video["id"] not in exclude_set]
         
         # Define our duration range in seconds
-        min_seconds = self.MIN_DURATION_MINUTES * 60
-        max_seconds = self.MAX_DURATION_MINUTES * 3600
+        if min_duration_minutes is None:
+            min_duration_minutes = self.MIN_DURATION_MINUTES
+        min_seconds = min_duration_minutes * 60
+        if max_duration_hours is None:
+            max_seconds = self.MAX_DURATION_MINUTES * 60
+        else:
+            max_seconds = int(max_duration_hours * 3600)
         
         # Process videos in batches to minimize API calls
         filtered_videos = []
-        batch_size = 10  # Process 10 videos at a time
+        # videos.list takes up to 50 IDs for the same single quota unit, so one
+        # request usually covers every search result
+        batch_size = 50
         
         for i in range(0, len(search_results), batch_size):
             # If we already have enough videos, stop processing
@@ -340,17 +444,15 @@ class YouTubeSearch:
                         if len(filtered_videos) >= max_results:
                             break
         
-        # Add filtering for already processed videos
-        if exclude_video_ids:
-            filtered_videos = [video for video in filtered_videos 
-                              if video['id'] not in exclude_video_ids]
-        
         return filtered_videos
 
     def get_video_by_url(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Get video metadata for a specific YouTube URL.
         
+        Metadata fetched within the last VIDEO_DETAILS_CACHE_TTL seconds is
+        served from a disk cache.
+        
         Args:
             url (str): YouTube video URL
             
@@ -360,15 +462,18 @@ class YouTubeSearch:
         video_id = extract_video_id(url)
         if not video_id:
             return None
+        
+        cached = _video_cache.get(video_id)
+        if cached is not None:
+            return dict(cached)
             
         try:
-            youtube = build('youtube', 'v3', developerKey=self.api_key)
-            
             # Get video details
-            video_response = youtube.videos().list(
+            video_response = self.youtube.videos().list(
                 part="snippet,statistics,contentDetails",
-                id=video_id
-            ).execute()
+                id=video_id,
+                fields=_VIDEO_FIELDS
+            ).execute(num_retries=YOUTUBE_NUM_RETRIES)
             
             # Check if video exists
             if not video_response.get("items"):
@@ -383,7 +488,7 @@ class YouTubeSearch:
             duration_str = content_details["duration"]
             duration_seconds = self._parse_duration_to_seconds(duration_str)
             
-            return {
+            video = {
                 "id": video_id,
                 "url": f"https://www.youtube.com/watch?v={video_id}",
                 "title": snippet["title"],
@@ -396,6 +501,8 @@ class YouTubeSearch:
                 "duration": duration_str,
                 "duration_seconds": duration_seconds
             }
+            _video_cache.set(video_id, video)
+            return dict(video)
             
         except HttpError as e:
             print(f"An HTTP error occurred: {e}")
@@ -409,68 +516,42 @@ if __name__ == "__main__":
     import time
     dotenv.load_dotenv()
 
+    def run_search_test(searcher: YouTubeSearch, query: str, date_filter: str, min_views: int,
+                        min_duration_minutes: int, max_duration_hours: float, max_results: int = 3):
+        """Run one search_and_filter scenario and print its results and timing."""
+        print(f"Searching for: '{query}' from {date_filter} with at least {min_views} views")
+        print(f"Duration range: {min_duration_minutes} minutes to {max_duration_hours} hours")
+        print(f"Max results: {max_results}")
+        
+        # Track time to measure performance
+        start_time = time.time()
+        
+        videos = searcher.search_and_filter(
+            query, date_filter, min_views, max_results,
+            min_duration_minutes=min_duration_minutes,
+            max_duration_hours=max_duration_hours
+        )
+        
+        elapsed_time = time.time() - start_time
+        
+        print(f"Found {len(videos)} videos in {elapsed_time:.2f} seconds:")
+        for i, video in enumerate(videos, 1):
+            print(f"\n{i}. {video['title']}")
+            print(f"   Channel: {video['channel_title']}")
+            print(f"   Views: {video['view_count']:,}")
+            print(f"   Duration: {video['duration']} ({video['duration_seconds']/60:.1f} minutes)")
+            print(f"   URL: {video['url']}")
+
+    # One searcher serves every scenario that does not need tracking
     searcher = YouTubeSearch()
     
     # Test search and filter
     print("\n=== Testing Search and Filter ===")
-    query = "Ai agent tutorials"
-    date_filter = "week"
-    min_views = 10000
-    min_duration_minutes = 10
-    max_duration_hours = 2.5
-    
-    print(f"Searching for: '{query}' from {date_filter} with at least {min_views} views")
-    print(f"Duration range: {min_duration_minutes} minutes to {max_duration_hours} hours")
-    
-    # Track time to measure performance
-    start_time = time.time()
-    
-    videos = searcher.search_and_filter(
-        query, date_filter, min_views, 
-        min_duration_minutes=min_duration_minutes,
-        max_duration_hours=max_duration_hours
-    )
-    
-    elapsed_time = time.time() - start_time
-    
-    print(f"Found {len(videos)} videos in {elapsed_time:.2f} seconds:")
-    for i, video in enumerate(videos, 1):
-        print(f"\n{i}. {video['title']}")
-        print(f"   Channel: {video['channel_title']}")
-        print(f"   Views: {video['view_count']:,}")
-        print(f"   Duration: {video['duration']} ({video['duration_seconds']/60:.1f} minutes)")
-        print(f"   URL: {video['url']}")
+    run_search_test(searcher, "Ai agent tutorials", "week", 10000, 10, 2.5)
     
     # Test with different parameters
     print("\n=== Testing with Different Parameters ===")
-    query = "podcast interview"
-    date_filter = "month"
-    min_views = 50000
-    min_duration_minutes = 30
-    max_duration_hours = 3.0
-    max_results = 3
-    
-    print(f"Searching for: '{query}' from {date_filter} with at least {min_views} views")
-    print(f"Duration range: {min_duration_minutes} minutes to {max_duration_hours} hours")
-    print(f"Max results: {max_results}")
-    
-    start_time = time.time()
-    
-    videos = searcher.search_and_filter(
-        query, date_filter, min_views, max_results,
-        min_duration_minutes=min_duration_minutes,
-        max_duration_hours=max_duration_hours
-    )
-    
-    elapsed_time = time.time() - start_time
-    
-    print(f"Found {len(videos)} videos in {elapsed_time:.2f} seconds:")
-    for i, video in enumerate(videos, 1):
-        print(f"\n{i}. {video['title']}")
-        print(f"   Channel: {video['channel_title']}")
-        print(f"   Views: {video['view_count']:,}")
-        print(f"   Duration: {video['duration']} ({video['duration_seconds']/60:.1f} minutes)")
-        print(f"   URL: {video['url']}")
+    run_search_test(searcher, "podcast interview", "month", 50000, 30, 3.0)
     
     # Test batch processing behavior
     print("\n=== Testing Batch Processing Behavior ===")
@@ -481,36 +562,8 @@ if __name__ == "__main__":
             print(f"  Getting details for batch of {len(video_ids)} videos...")
             return super().get_video_details(video_ids)
     
-    tracked_searcher = TrackedYouTubeSearch()
-    
-    query = "ted talks"
-    date_filter = "month"
-    min_views = 100000
-    min_duration_minutes = 15
-    max_duration_hours = 1.0
-    max_results = 2  # Small number to test early stopping
-    
-    print(f"Searching for: '{query}' from {date_filter} with at least {min_views} views")
-    print(f"Duration range: {min_duration_minutes} minutes to {max_duration_hours} hours")
-    print(f"Max results: {max_results} (Testing early stopping)")
-    
-    start_time = time.time()
-    
-    videos = tracked_searcher.search_and_filter(
-        query, date_filter, min_views, max_results,
-        min_duration_minutes=min_duration_minutes,
-        max_duration_hours=max_duration_hours
-    )
-    
-    elapsed_time = time.time() - start_time
-    
-    print(f"Found {len(videos)} videos in {elapsed_time:.2f} seconds:")
-    for i, video in enumerate(videos, 1):
-        print(f"\n{i}. {video['title']}")
-        print(f"   Channel: {video['channel_title']}")
-        print(f"   Views: {video['view_count']:,}")
-        print(f"   Duration: {video['duration']} ({video['duration_seconds']/60:.1f} minutes)")
-        print(f"   URL: {video['url']}")
+    # Small number of results to test early stopping
+    run_search_test(TrackedYouTubeSearch(searcher.api_key), "ted talks", "month", 100000, 15, 1.0, max_results=2)
     
     # Test getting video by URL
     print("\n=== Testing Get Video by URL ===")
@@ -0,0 +1,77 @@
+import atexit
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import httplib2
+from googleapiclient.discovery import build
+
+# Socket timeout of YouTube API requests, in seconds
+YOUTUBE_HTTP_TIMEOUT = int(os.getenv("YOUTUBE_HTTP_TIMEOUT", 30))
+
+# Retries of a YouTube API request on 429, 5xx and rate-limit errors. Pass
+# to execute(num_retries=...) to get exponential backoff between attempts
+YOUTUBE_NUM_RETRIES = int(os.getenv("YOUTUBE_NUM_RETRIES", 3))
+
+# Worker threads for YouTube fetches (transcripts, comments). The threads live
+# as long as the process, so their per-thread clients below are reused across
+# videos and batches instead of being built for every short-lived pool
+YOUTUBE_IO_WORKERS = int(os.getenv("YOUTUBE_IO_WORKERS", 8))
+youtube_executor = ThreadPoolExecutor(max_workers=YOUTUBE_IO_WORKERS, thread_name_prefix="youtube-io")
+
+# googleapiclient service objects wrap an httplib2.Http connection that is not
+# thread-safe, so clients are cached per thread and reused for every request
+# that thread makes. This keeps the TLS connection alive between calls instead
+# of building a new client (and connection) for each request. Only weak
+# references are kept across threads: when a thread ends, its clients are
+# released and their connections closed.
+_local = threading.local()
+_all_clients = weakref.WeakSet()
+_all_clients_lock = threading.Lock()
+
+
+def get_youtube_client(api_key: str):
+    """
+    Get the YouTube Data API client for the current thread.
+
+    Args:
+        api_key: YouTube Data API key
+
+    Returns:
+        A googleapiclient Resource for YouTube Data API v3
+    """
+    clients = getattr(_local, "youtube", None)
+    if clients is None:
+        clients = _local.youtube = {}
+
+    client = clients.get(api_key)
+    if client is None:
+        # The discovery document ships with googleapiclient, so no fetch or
+        # discovery cache is needed to build the client. The dedicated Http
+        # keeps its connection alive and bounds hung requests with a timeout
+        http = httplib2.Http(timeout=YOUTUBE_HTTP_TIMEOUT)
+        client = build(
+            'youtube', 'v3',
+            developerKey=api_key,
+            http=http,
+            static_discovery=True,
+            cache_discovery=False
+        )
+        weakref.finalize(client, http.close)
+        clients[api_key] = client
+        with _all_clients_lock:
+            _all_clients.add(client)
+    return client
+
+
+@atexit.register
+def close_clients() -> None:
+    """Close the HTTP connections of every client created in this process."""
+    with _all_clients_lock:
+        for client in list(_all_clients):
+            try:
+                client.close()
+            except Exception:
+                pass
+        _all_clients.clear()
@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directory holding caches that persist across process runs
+CACHE_DIR = Path(os.getenv("CACHE_DIR") or Path.home() / ".cache" / "summary_report_crew")
+
+
+class JsonFileCache:
+    """
+    Thread-safe key/value cache persisted to a JSON file.
+
+    Entries are loaded from disk on first access and the whole file is
+    rewritten atomically on every change, so it is meant for small caches
+    (IDs, hashes, metadata) that are read far more often than written.
+    Disk errors are logged and never raised; the cache then behaves as if empty.
+    """
+
+    def __init__(self, name: str, ttl: Optional[float] = None, directory: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            name: File name of the cache, without extension
+            ttl: Optional lifetime of an entry in seconds; entries never expire if omitted
+            directory: Optional directory for the cache file. Defaults to CACHE_DIR
+        """
+        self.path = Path(directory or CACHE_DIR) / f"{name}.json"
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the entries from disk once. Must be called with the lock held."""
+        if self._entries is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    self._entries = json.loads(f.read())
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                logger.debug("Ignoring unreadable cache %s: %s", self.path, e)
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        """Write the entries to disk atomically. Must be called with the lock held."""
+        if self.ttl is not None:
+            # Expired entries are dropped on write so the file does not grow forever
+            cutoff = time.time() - self.ttl
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if entry["time"] >= cutoff
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug("Could not write cache %s: %s", self.path, e)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Key of the entry
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.time() - entry["time"] > self.ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            key: Key of the entry
+            value: Value to cache
+        """
+        with self._lock:
+            self._load()[key] = {"value": value, "time": time.time()}
+            self._save()
+
+    def set_many(self, values: Dict[str, Any]) -> None:
+        """
+        Store several JSON-serializable values with a single write.
+
+        Args:
+            values: Values to cache by key
+        """
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            for key, value in values.items():
+                entries[key] = {"value": value, "time": now}
+            self._save()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+
+    def delete_value(self, value: Any) -> None:
+        """Remove every entry holding the given value."""
+        with self._lock:
+            entries = self._load()
+            stale = [key for key, entry in entries.items() if entry["value"] == value]
+            for key in stale:
+                del entries[key]
+            if stale:
+                self._save()
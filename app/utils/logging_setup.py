@@ -0,0 +1,41 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Route application logging through a background queue listener.
+
+    Worker threads only enqueue log records; formatting and the stdout write
+    happen on the listener thread, so logging never contends on the stdout
+    lock in the hot path. Safe to call more than once.
+
+    Args:
+        level: Log level name. Defaults to the LOG_LEVEL environment variable or INFO
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)